@@ -5,8 +5,10 @@ This pipeline converts ANY JSON file to CSV automatically.
 Just provide the file path - no configuration needed!
 """
 
+import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from src.pipeline import JSONToCSVPipeline
+from src.pipeline import JSONToCSVPipeline, unique_output_names
 
 
 # ============================================================================
@@ -64,19 +66,28 @@ def example_custom_filename():
 # Example 4: Process Multiple Files
 # ============================================================================
 
+def _convert_one(json_path: str, output_filename: str) -> Path:
+    """Convert a single file (top-level so it can run in a worker process)"""
+    pipeline = JSONToCSVPipeline(json_path)
+    return pipeline.run(output_filename=output_filename)
+
+
 def example_batch():
-    """Convert all JSON files in a directory"""
+    """Convert all JSON files in a directory (in parallel, one process per core)"""
     print("\n" + "="*60)
     print("Example 4: Batch Processing")
     print("="*60)
     
     input_dir = Path("data/input")
     json_files = list(input_dir.glob("*.json"))
+    # Named after each input, so parallel runs never share a filename
+    output_names = unique_output_names(map(str, json_files))
+    
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        output_files = list(executor.map(_convert_one, map(str, json_files), output_names))
     
-    for json_file in json_files:
-        print(f"\nConverting: {json_file.name}")
-        pipeline = JSONToCSVPipeline(str(json_file))
-        output_file = pipeline.run()
+    for json_file, output_file in zip(json_files, output_files):
+        print(f"\nConverted: {json_file.name}")
         print(f"  -> {output_file.name}")
 
 
@@ -9,16 +9,24 @@ Supports multiple conversion modes for nested JSON.
 import os
 import sys
 import argparse
-from pathlib import Path
-from src.pipeline import JSONToCSVPipeline
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import List, Optional
+from src.pipeline import JSONToCSVPipeline, unique_output_names
 
 
-def get_file_size_mb(file_path: str) -> float:
-    """Get file size in MB"""
-    return os.path.getsize(file_path) / (1024 * 1024)
+def get_file_size_mb(file_path: str, stat_result: Optional[os.stat_result] = None) -> float:
+    """Get file size in MB (reuses stat_result when already available)"""
+    st = stat_result if stat_result is not None else os.stat(file_path)
+    return st.st_size / (1 << 20)
 
 
-def convert_json_to_csv(input_file: str, output_dir: str = "data/output", mode: int = None):
+def convert_json_to_csv(
+    input_file: str,
+    output_dir: str = "data/output",
+    mode: int = None,
+    output_filename: Optional[str] = None
+):
     """
     Convert any JSON file to CSV.
     
@@ -26,31 +34,41 @@ def convert_json_to_csv(input_file: str, output_dir: str = "data/output", mode:
         input_file: Path to your JSON file
         output_dir: Where to save the CSV file
         mode: Conversion mode (1=flat, 2=explode, 3=relational), None=interactive
+        output_filename: Custom output filename (optional)
     
     Returns:
         List of paths to created CSV files
     """
-    pipeline = JSONToCSVPipeline(input_file=input_file, output_dir=output_dir)
+    # Interactive runs parse the file for the analysis first; keep that
+    # parse for the conversion instead of reading the JSON again
+    pipeline = JSONToCSVPipeline(
+        input_file=input_file, output_dir=output_dir, cache_parsed=mode is None
+    )
     
     if mode:
-        return pipeline.run_with_mode(mode)
+        return pipeline.run_with_mode(mode, output_filename)
     else:
-        return pipeline.run_interactive()
+        return pipeline.run_interactive(output_filename)
 
 
-def run_conversion(file_path: str, mode: int = None):
+def run_conversion(
+    file_path: str,
+    mode: int = None,
+    stat_result: Optional[os.stat_result] = None,
+    output_filename: Optional[str] = None
+):
     """Run conversion on a given file path"""
-    # Show file info
-    file_size = get_file_size_mb(file_path)
-    print(f"\nFile: {file_path}")
-    print(f"Size: {file_size:.2f} MB")
-    
-    if file_size > 500:
-        print("\nNote: Large file detected. Using chunked processing...")
-    
-    # Run the conversion
     try:
-        output_files = convert_json_to_csv(file_path, mode=mode)
+        # Show file info
+        file_size = get_file_size_mb(file_path, stat_result)
+        print(f"\nFile: {file_path}")
+        print(f"Size: {file_size:.2f} MB")
+        
+        if file_size > 500:
+            print("\nNote: Large file detected. Using chunked processing...")
+        
+        # Run the conversion
+        output_files = convert_json_to_csv(file_path, mode=mode, output_filename=output_filename)
         if output_files:
             print(f"\n{'=' * 65}")
             print(f"  SUCCESS! CSV file(s) created:")
@@ -64,6 +82,19 @@ def run_conversion(file_path: str, mode: int = None):
         print("Check logs/pipeline.log for details.")
 
 
+def run_batch(file_paths: List[str], mode: int = 1):
+    """
+    Convert several files in parallel, one worker process per CPU core.
+    
+    Each output is named after its input file (numbered when two inputs
+    share a stem), so parallel conversions never write to the same file.
+    Each worker logs to its own file next to logs/pipeline.log.
+    """
+    output_names = unique_output_names(file_paths)
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        list(executor.map(run_conversion, file_paths, repeat(mode), repeat(None), output_names))
+
+
 def interactive_file_selection(mode: int = None):
     """Interactive file selection when no file is provided"""
     print("=" * 65)
@@ -82,12 +113,15 @@ def interactive_file_selection(mode: int = None):
             print("Error: Please enter a file path.\n")
             continue
         
-        if not os.path.exists(file_path):
+        # Single stat call: existence and size come from the same result
+        try:
+            stat_result = os.stat(file_path)
+        except OSError:
             print(f"Error: File not found - {file_path}")
             print("Please check the path and try again.\n")
             continue
         
-        if not file_path.lower().endswith('.json'):
+        if not file_path.lower().endswith(('.json', '.jsonl', '.ndjson')):
             print("Warning: File does not have .json extension.")
             confirm = input("Continue anyway? (y/n): ").strip().lower()
             if confirm != 'y':
@@ -95,7 +129,7 @@ def interactive_file_selection(mode: int = None):
         
         break
     
-    run_conversion(file_path, mode)
+    run_conversion(file_path, mode, stat_result)
 
 
 def main():
@@ -113,6 +147,7 @@ Examples:
   python run_pipeline.py                          # Interactive file selection
   python run_pipeline.py data.json                # Interactive mode selection
   python run_pipeline.py data.json --mode 3       # Direct relational mode
+  ls data/*.json | python run_pipeline.py -m 2    # Batch: paths from stdin
         '''
     )
     parser.add_argument(
@@ -133,6 +168,11 @@ Examples:
     if args.input_file:
         # File provided via command line
         run_conversion(args.input_file, args.mode)
+    elif not sys.stdin.isatty():
+        # Piped/scripted: newline-delimited paths on stdin, no prompts
+        # (FLAT mode unless --mode is given, since nobody can answer)
+        paths = [line.strip() for line in sys.stdin if line.strip()]
+        run_batch(paths, args.mode or 1)
     else:
         # Interactive file selection
         interactive_file_selection(args.mode)
@@ -4,13 +4,43 @@ Analyzes JSON structure to detect nesting levels, array types, and field informa
 """
 
 import json
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Sequence, Tuple
 from pathlib import Path
 from dataclasses import dataclass, field
 import logging
 
+from src.extractor import PARSED_CACHE_MAX_MB, DataExtractor
+from src.json_utils import WRAPPER_KEYS, is_ndjson, unwrap_records
+
+# Try to import ijson for streaming analysis (avoids loading the whole file)
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Number of records used to estimate exploded row counts
+ESTIMATE_SAMPLE_SIZE = 100
+
+# Per-record cap on the exploded row multiplier (stops runaway products)
+MAX_EXPLODE_MULTIPLIER = 10 ** 9
+
+# JSON type name by exact Python type (type(True) is bool, so no int/bool ambiguity)
+_JSON_TYPE_NAMES = {
+    type(None): "null",
+    bool: "boolean",
+    int: "integer",
+    float: "number",
+    str: "string",
+    dict: "object",
+    list: "array",
+}
+
+# Encoder for truncated sample values (iterencode yields output incrementally)
+_SAMPLE_ENCODER = json.JSONEncoder(ensure_ascii=False)
+
 
 @dataclass
 class FieldInfo:
@@ -51,8 +81,10 @@ class JSONAnalyzer:
     - Estimated output sizes for each mode
     """
     
-    def __init__(self, file_path: str):
+    def __init__(self, file_path: str, cache_parsed: bool = False):
         self.file_path = Path(file_path)
+        # Passed to the extractor that parses the file (see _parsed_head)
+        self.cache_parsed = cache_parsed
         self.sample_data: List[Dict] = []
         self.analysis: Optional[StructureAnalysis] = None
         
@@ -71,34 +103,28 @@ class JSONAnalyzer:
         # Get file size
         file_size_mb = self.file_path.stat().st_size / (1024 * 1024)
         
-        # Load sample data
-        with open(self.file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        # Normalize to list
-        if isinstance(data, dict):
-            # Check for common wrapper keys
-            for key in ['data', 'records', 'results', 'items', 'rows']:
-                if key in data and isinstance(data[key], list):
-                    data = data[key]
-                    break
-            else:
-                data = [data]
-        
-        record_count = len(data)
-        self.sample_data = data[:sample_size]
+        # Load only the records needed for sampling and estimation
+        head_size = max(sample_size, ESTIMATE_SAMPLE_SIZE)
+        if is_ndjson(self.file_path):
+            head, record_count = self._ndjson_head(head_size)
+        elif self.cache_parsed and file_size_mb <= PARSED_CACHE_MAX_MB:
+            # The whole parse is kept for the conversion, so it is not wasted
+            head, record_count = self._parsed_head(head_size)
+        elif IJSON_AVAILABLE:
+            head, record_count = self._stream_head(head_size)
+        else:
+            head, record_count = self._load_head(head_size)
         
-        # Analyze structure from first record
-        fields, max_depth = self._analyze_record(self.sample_data[0] if self.sample_data else {})
+        self.sample_data = head[:sample_size]
         
-        # Find nested arrays (arrays of objects)
-        nested_arrays = self._find_nested_arrays(fields)
+        # Analyze structure from first record: fields, depth, nested arrays
+        # (arrays of objects) and flat field count in a single pass
+        fields, max_depth, nested_arrays, flat_count = self._analyze_record(
+            self.sample_data[0] if self.sample_data else {}
+        )
         
         # Calculate estimated exploded rows
-        exploded_rows = self._estimate_exploded_rows(data[:min(100, len(data))], nested_arrays)
-        
-        # Count flat fields
-        flat_count = self._count_flat_fields(fields)
+        exploded_rows = self._estimate_exploded_rows(head[:ESTIMATE_SAMPLE_SIZE], nested_arrays)
         
         self.analysis = StructureAnalysis(
             file_path=str(self.file_path),
@@ -116,70 +142,210 @@ class JSONAnalyzer:
         logger.info(f"Analysis complete: {record_count} records, depth={max_depth}, nested_arrays={len(nested_arrays)}")
         return self.analysis
     
-    def _analyze_record(self, record: Dict, path: str = "", depth: int = 0) -> Tuple[List[FieldInfo], int]:
-        """Recursively analyze a record's structure."""
-        fields = []
-        max_depth = depth
+    def _load_head(self, head_size: int) -> Tuple[List[Dict], int]:
+        """Load the whole file and return (first head_size records, record count)."""
+        with open(self.file_path, 'r', encoding='utf-8') as f:
+            data = unwrap_records(json.load(f))
+        
+        return data[:head_size], len(data)
+    
+    def _parsed_head(self, head_size: int) -> Tuple[List[Dict], int]:
+        """
+        Parse the file through the extractor and return (first head_size records, record count).
+        
+        Only used with cache_parsed, for files the cache can hold (up to
+        PARSED_CACHE_MAX_MB): the extractor memoizes the parsed records per
+        file version, so a pipeline extracting the same file after analysis
+        (run_interactive) reuses this parse instead of reading the JSON a
+        second time. Otherwise analyze() streams just the head.
+        """
+        data = DataExtractor(self.file_path, cache_parsed=True).extract_from_json()
+        return data[:head_size], len(data)
+    
+    def _ndjson_head(self, head_size: int) -> Tuple[List[Dict], int]:
+        """Parse the first head_size lines of a JSON Lines file and count the rest."""
+        head = []
+        record_count = 0
+        with open(self.file_path, 'rb') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                if record_count < head_size:
+                    head.append(json.loads(line))
+                record_count += 1
+        
+        return head, record_count
+    
+    def _stream_head(self, head_size: int) -> Tuple[List[Dict], int]:
+        """
+        Stream the file with ijson and return (first head_size records, record count).
+        
+        A single pass over the ijson event stream finds the record array,
+        counts its items and builds only the first head_size records.
+        Peak memory is O(head_size records).
+        """
+        with open(self.file_path, 'rb') as f:
+            events = ijson.parse(f, use_float=True)
+            _, first_event, _ = next(events, ('', None, None))
+            
+            if first_event == 'start_array':
+                array_prefix = ''
+                counts, heads = self._scan_items(events, [array_prefix], head_size)
+                counts.setdefault(array_prefix, 0)
+            elif first_event == 'start_map':
+                counts, heads = self._scan_items(events, WRAPPER_KEYS, head_size)
+                array_prefix = next((key for key in WRAPPER_KEYS if key in counts), None)
+                if array_prefix is None:
+                    # Single JSON object - treat as one record
+                    f.seek(0)
+                    return [next(ijson.items(f, '', use_float=True))], 1
+            else:
+                return [], 0
+        
+        return heads.get(array_prefix, []), counts[array_prefix]
+    
+    def _scan_items(
+        self,
+        events,
+        array_prefixes: Sequence[str],
+        head_size: int
+    ) -> Tuple[Dict[str, int], Dict[str, List]]:
+        """
+        Count array items from an ijson event stream, building only the first few.
+        
+        Items beyond head_size are counted from their start event alone and
+        never turned into Python objects.
+        
+        Args:
+            events: ijson.parse event iterator
+            array_prefixes: ijson prefixes of the arrays to scan ('' for top level)
+            head_size: Number of leading items to build per array
+            
+        Returns:
+            Tuple of (item count per array prefix found in the stream,
+            first head_size items per array prefix)
+        """
+        item_prefixes = {(f"{p}.item" if p else "item"): p for p in array_prefixes}
+        counts: Dict[str, int] = {}
+        heads: Dict[str, List] = {}
+        builder = None
+        builder_prefix = builder_array = None
+        
+        for prefix, event, value in events:
+            if builder is not None:
+                # Inside a head item: feed events until its closing event
+                builder.event(event, value)
+                if prefix == builder_prefix and event in ('end_map', 'end_array'):
+                    heads.setdefault(builder_array, []).append(builder.value)
+                    builder = None
+                continue
+            
+            if event == 'start_array' and prefix in array_prefixes:
+                counts.setdefault(prefix, 0)
+                heads.setdefault(prefix, [])
+            elif prefix in item_prefixes and event not in ('end_map', 'end_array', 'map_key'):
+                array_prefix = item_prefixes[prefix]
+                seen = counts.get(array_prefix, 0)
+                counts[array_prefix] = seen + 1
+                if seen < head_size:
+                    if event in ('start_map', 'start_array'):
+                        builder = ijson.ObjectBuilder()
+                        builder.event(event, value)
+                        builder_prefix, builder_array = prefix, array_prefix
+                    else:
+                        heads.setdefault(array_prefix, []).append(value)
+        
+        return counts, heads
+    
+    def _analyze_record(self, record: Dict) -> Tuple[List[FieldInfo], int, List[FieldInfo], int]:
+        """
+        Analyze a record's structure with one iterative depth-first pass.
+        
+        Uses an explicit stack instead of recursion, so arbitrarily deep JSON
+        cannot hit the interpreter's recursion limit.
+        
+        Returns:
+            Tuple of (fields, max_depth, nested_arrays, flat_field_count).
+            nested_arrays lists arrays of objects in depth-first order;
+            flat_field_count is the number of columns after flattening nested
+            objects (arrays count as one column each).
+        """
+        fields: List[FieldInfo] = []
+        nested_arrays: List[FieldInfo] = []
+        max_depth = 0
+        flat_count = 0
+        
+        # Stack entries: (items iterator, path, depth, output list, counts as flat column)
+        stack = [(iter(record.items()), "", 0, fields, True)]
+        
+        # Bind per-field callables once; the loop body runs for every field
+        get_type = self._get_type
+        get_sample_value = self._get_sample_value
+        push = stack.append
         
-        for key, value in record.items():
+        while stack:
+            items, path, depth, siblings, is_flat_scope = stack[-1]
+            entry = next(items, None)
+            if entry is None:
+                stack.pop()
+                continue
+            
+            key, value = entry
             current_path = f"{path}.{key}" if path else key
-            field_type = self._get_type(value)
+            field_type = get_type(value)
             
             field_info = FieldInfo(
                 name=key,
                 field_type=field_type,
                 path=current_path,
                 depth=depth,
-                sample_value=self._get_sample_value(value)
+                sample_value=get_sample_value(value)
             )
+            siblings.append(field_info)
             
             if isinstance(value, dict):
-                # Nested object - recurse
-                children, child_depth = self._analyze_record(value, current_path, depth + 1)
-                field_info.children = children
-                max_depth = max(max_depth, child_depth)
+                # Nested object - descend, flattened columns stay in scope
+                push((iter(value.items()), current_path, depth + 1, field_info.children, is_flat_scope))
+                max_depth = max(max_depth, depth + 1)
                 
-            elif isinstance(value, list) and value:
-                first_item = value[0]
-                if isinstance(first_item, dict):
-                    # Array of objects - important!
-                    field_info.is_array_of_objects = True
-                    field_info.array_item_count = len(value)
-                    children, child_depth = self._analyze_record(first_item, current_path, depth + 1)
-                    field_info.children = children
-                    max_depth = max(max_depth, child_depth)
-                else:
+            elif isinstance(value, list) and value and isinstance(value[0], dict):
+                # Array of objects - important! Becomes one column in flat mode
+                field_info.is_array_of_objects = True
+                field_info.array_item_count = len(value)
+                nested_arrays.append(field_info)
+                if is_flat_scope:
+                    flat_count += 1
+                push((iter(value[0].items()), current_path, depth + 1, field_info.children, False))
+                max_depth = max(max_depth, depth + 1)
+                
+            else:
+                if isinstance(value, list):
                     # Array of primitives
                     field_info.array_item_count = len(value)
-            
-            fields.append(field_info)
+                if is_flat_scope and field_type != "unknown":
+                    flat_count += 1
         
-        return fields, max_depth
+        return fields, max_depth, nested_arrays, flat_count
     
     def _get_type(self, value: Any) -> str:
         """Get JSON type string for a value."""
-        if value is None:
-            return "null"
-        elif isinstance(value, bool):
-            return "boolean"
-        elif isinstance(value, int):
-            return "integer"
-        elif isinstance(value, float):
-            return "number"
-        elif isinstance(value, str):
-            return "string"
-        elif isinstance(value, dict):
-            return "object"
-        elif isinstance(value, list):
-            return "array"
-        return "unknown"
+        return _JSON_TYPE_NAMES.get(type(value), "unknown")
     
     def _get_sample_value(self, value: Any, max_length: int = 30) -> str:
         """Get a truncated sample value for display."""
         if value is None:
             return "null"
         elif isinstance(value, (dict, list)):
-            s = json.dumps(value, ensure_ascii=False)
+            # Encode incrementally and stop once max_length is exceeded,
+            # so large nested values are never fully serialized
+            pieces = []
+            length = 0
+            for chunk in _SAMPLE_ENCODER.iterencode(value):
+                pieces.append(chunk)
+                length += len(chunk)
+                if length > max_length:
+                    break
+            s = "".join(pieces)
             if len(s) > max_length:
                 return s[:max_length-3] + "..."
             return s
@@ -189,53 +355,26 @@ class JSONAnalyzer:
                 return s[:max_length-3] + "..."
             return s
     
-    def _find_nested_arrays(self, fields: List[FieldInfo]) -> List[FieldInfo]:
-        """Find all arrays that contain objects (need special handling)."""
-        nested = []
-        
-        def recurse(field_list: List[FieldInfo]):
-            for f in field_list:
-                if f.is_array_of_objects:
-                    nested.append(f)
-                if f.children:
-                    recurse(f.children)
-        
-        recurse(fields)
-        return nested
-    
-    def _count_flat_fields(self, fields: List[FieldInfo]) -> int:
-        """Count total flat fields after flattening nested objects."""
-        count = 0
-        
-        def recurse(field_list: List[FieldInfo]):
-            nonlocal count
-            for f in field_list:
-                if f.field_type in ('string', 'integer', 'number', 'boolean', 'null'):
-                    count += 1
-                elif f.field_type == 'array' and not f.is_array_of_objects:
-                    count += 1  # Will become pipe-separated string
-                elif f.field_type == 'array' and f.is_array_of_objects:
-                    count += 1  # Will become JSON string (flat mode)
-                elif f.field_type == 'object':
-                    recurse(f.children)
-        
-        recurse(fields)
-        return count
-    
     def _estimate_exploded_rows(self, sample_data: List[Dict], nested_arrays: List[FieldInfo]) -> int:
         """Estimate total rows after full explosion."""
         if not nested_arrays:
             return len(sample_data)
         
+        # Split each array path once, not once per record
+        array_paths = [tuple(arr_field.path.split('.')) for arr_field in nested_arrays]
         total_multiplier = 0
         
         for record in sample_data:
             record_multiplier = 1
-            for arr_field in nested_arrays:
+            for parts in array_paths:
                 # Navigate to the array in the record
-                value = self._get_nested_value(record, arr_field.path)
+                value = self._get_nested_value(record, parts)
                 if isinstance(value, list):
                     record_multiplier *= max(1, len(value))
+                    if record_multiplier > MAX_EXPLODE_MULTIPLIER:
+                        # Estimate is already beyond any practical size
+                        record_multiplier = MAX_EXPLODE_MULTIPLIER
+                        break
             total_multiplier += record_multiplier
         
         # Extrapolate to full dataset
@@ -244,9 +383,8 @@ class JSONAnalyzer:
             return int(avg_multiplier * self.analysis.record_count if self.analysis else total_multiplier)
         return total_multiplier
     
-    def _get_nested_value(self, record: Dict, path: str) -> Any:
-        """Get value from nested path like 'projects' or 'projects.tasks'."""
-        parts = path.split('.')
+    def _get_nested_value(self, record: Dict, parts: Tuple[str, ...]) -> Any:
+        """Get value from nested path parts like ('projects',) or ('projects', 'tasks')."""
         value = record
         
         for part in parts:
@@ -270,10 +408,19 @@ class JSONAnalyzer:
             return "No analysis available. Call analyze() first."
         
         lines = []
+        # Prefix tokens for the current path: pushed on descent, truncated on ascent
+        prefix_stack: List[str] = []
         
-        def print_field(field: FieldInfo, prefix: str = "", is_last: bool = True):
+        # Explicit stack of (field, depth, is_last); children are pushed in
+        # reverse so they pop in their original order
+        top_level = self.analysis.fields
+        stack = [(f, 0, i == len(top_level) - 1) for i, f in reversed(list(enumerate(top_level)))]
+        
+        while stack:
+            field, depth, is_last = stack.pop()
+            del prefix_stack[depth:]
+            
             connector = "└── " if is_last else "├── "
-            type_indicator = ""
             
             if field.is_array_of_objects:
                 type_indicator = f" (array of objects, ~{field.array_item_count} items)"
@@ -284,14 +431,12 @@ class JSONAnalyzer:
             else:
                 type_indicator = f" ({field.field_type})"
             
-            lines.append(f"{prefix}{connector}{field.name}{type_indicator}")
+            lines.append("".join(prefix_stack) + connector + field.name + type_indicator)
             
             if field.children:
-                new_prefix = prefix + ("    " if is_last else "│   ")
-                for i, child in enumerate(field.children):
-                    print_field(child, new_prefix, i == len(field.children) - 1)
-        
-        for i, field in enumerate(self.analysis.fields):
-            print_field(field, "", i == len(self.analysis.fields) - 1)
+                prefix_stack.append("    " if is_last else "│   ")
+                last = len(field.children) - 1
+                for i in range(last, -1, -1):
+                    stack.append((field.children[i], depth + 1, i == last))
         
         return "\n".join(lines)
@@ -4,18 +4,73 @@ Handles reading and extracting data from JSON files with comprehensive error han
 Supports chunked processing for large files (500MB+).
 """
 
+import itertools
 import json
+import mmap
 import os
-import pandas as pd
+from collections import OrderedDict
 from pathlib import Path
-from typing import List, Dict, Union, Generator, Optional
+from typing import TYPE_CHECKING, List, Dict, Union, Generator, Iterable, Optional, Tuple
 import logging
+from dataclasses import dataclass
+
+from src.json_utils import WRAPPER_KEYS, dumps_cell, find_wrapper_key, is_ndjson
+
+# pandas is imported lazily in extract_to_dataframe (~300ms / ~60MB at import)
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Try to import fast JSON parsers (fall back to stdlib json)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import simdjson
+    SIMDJSON_AVAILABLE = True
+except ImportError:
+    SIMDJSON_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
 # File size threshold for chunked processing (500 MB)
 LARGE_FILE_THRESHOLD_MB = 500
 
+# Payload size above which simdjson is preferred over orjson (200 MB)
+SIMDJSON_THRESHOLD_MB = 200
+
+# File size above which the input is memory-mapped instead of read (100 MB)
+MMAP_THRESHOLD_MB = 100
+
+# Total input size of the parsed files kept for reuse with cache_parsed=True
+# (256 MB); a bigger file is parsed without being cached
+PARSED_CACHE_MAX_MB = 256
+
+# Records per DataFrame yielded by iter_dataframes
+DATAFRAME_CHUNK_ROWS = 50_000
+
+# Marks an empty record stream (a record itself may be null)
+_NO_RECORD = object()
+
+# Parsed records by (path, mtime_ns, size), least recently used first
+_parsed_cache: "OrderedDict[Tuple[str, int, int], List[Dict]]" = OrderedDict()
+
+
+@dataclass
+class _RawMeta:
+    """What get_data_info needs once the raw records have been released."""
+    record_count: int
+    sample_record: Optional[Dict] = None
+    fields: Optional[List[str]] = None
+
+    @classmethod
+    def from_records(cls, records: List[Dict]) -> "_RawMeta":
+        sample = records[0] if records else None
+        fields = list(sample.keys()) if isinstance(sample, dict) else None
+        return cls(len(records), sample, fields)
+
 
 class DataExtractor:
     """
@@ -23,15 +78,20 @@ class DataExtractor:
     Automatically uses chunked processing for large files.
     """
 
-    def __init__(self, input_path: Union[str, Path]):
+    def __init__(self, input_path: Union[str, Path], cache_parsed: bool = False):
         """
         Initialize the DataExtractor.
         
         Args:
             input_path: Path to the input JSON file or directory
+            cache_parsed: Keep the parsed records in a process-wide cache
+                (bounded by PARSED_CACHE_MAX_MB of input), so later
+                extractors over the same unchanged file skip the parse
         """
         self.input_path = Path(input_path)
+        self.cache_parsed = cache_parsed
         self.raw_data: List[Dict] = []
+        self._raw_meta: Optional[_RawMeta] = None
         self.is_large_file = False
         logger.info(f"DataExtractor initialized with input path: {self.input_path}")
 
@@ -77,12 +137,19 @@ class DataExtractor:
         self._check_large_file()
 
         try:
-            if self.is_large_file:
+            if is_ndjson(self.input_path):
+                # One record per line; no whole-document parse
+                records = self._extract_ndjson()
+            elif self.is_large_file:
                 # Use streaming for large files
-                return self._extract_large_json()
+                records = self._extract_large_json()
             else:
                 # Use standard loading for normal files
-                return self._extract_standard_json()
+                records = self._extract_standard_json()
+
+            # Bind once for every branch; the parsed list is kept, not copied
+            self.raw_data = records
+            return records
 
         except json.JSONDecodeError as e:
             error_msg = f"Invalid JSON format: {str(e)}"
@@ -94,22 +161,143 @@ class DataExtractor:
             logger.error(error_msg)
             raise
 
+    def _parse_json_bytes(self, raw: Union[bytes, memoryview]):
+        """
+        Parse raw JSON bytes with the fastest available parser.
+        
+        Uses simdjson for very large payloads, orjson otherwise, and falls
+        back to stdlib json. Parse errors are always raised as
+        json.JSONDecodeError (orjson.JSONDecodeError already subclasses it).
+        orjson and simdjson parse memoryviews in place without copying.
+        """
+        if SIMDJSON_AVAILABLE and len(raw) > SIMDJSON_THRESHOLD_MB * 1024 * 1024:
+            try:
+                doc = simdjson.Parser().parse(raw)
+            except ValueError as e:
+                raise json.JSONDecodeError(str(e), "", 0)
+            if isinstance(doc, simdjson.Array):
+                return doc.as_list()
+            if isinstance(doc, simdjson.Object):
+                return doc.as_dict()
+            return doc
+
+        if ORJSON_AVAILABLE:
+            return orjson.loads(raw)
+
+        return json.loads(bytes(raw) if isinstance(raw, memoryview) else raw)
+
+    def _map_file(self, f) -> mmap.mmap:
+        """
+        Memory-map an open binary file read-only.
+        
+        Hints sequential access where supported, so the kernel reads ahead
+        aggressively and drops pages behind the parser.
+        """
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if hasattr(mm, 'madvise') and hasattr(mmap, 'MADV_SEQUENTIAL'):
+            mm.madvise(mmap.MADV_SEQUENTIAL)
+        return mm
+
+    def _parse_mmapped_json(self, f) -> Union[List, Dict]:
+        """Parse an open binary file straight from a read-only memory map."""
+        mm = self._map_file(f)
+        try:
+            with memoryview(mm) as buffer:
+                return self._parse_json_bytes(buffer)
+        finally:
+            mm.close()
+
     def _extract_standard_json(self) -> List[Dict]:
-        """Extract data using standard JSON loading (for smaller files)."""
-        with open(self.input_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        """
+        Extract data using standard JSON loading (for smaller files).
+        
+        With cache_parsed, the records are memoized on (path, mtime, size),
+        so several extractors over the same unchanged file parse it only
+        once. The returned list is then shared between callers and must be
+        treated as read-only. Large files are never cached.
+        """
+        if self.is_large_file or not self.cache_parsed:
+            return self._read_standard_json()
+        return _read_standard_json_cached(self)
+
+    def _read_standard_json(self) -> List[Dict]:
+        """Parse and normalize the input file (uncached)."""
+        use_mmap = (
+            (ORJSON_AVAILABLE or SIMDJSON_AVAILABLE)
+            and self._get_file_size_mb() > MMAP_THRESHOLD_MB
+        )
+        with open(self.input_path, 'rb') as f:
+            if use_mmap:
+                # Zero-copy: parser reads the page cache, no bytes object
+                data = self._parse_mmapped_json(f)
+            else:
+                data = self._parse_json_bytes(f.read())
 
         # Handle different JSON structures
-        self.raw_data = self._normalize_json_structure(data)
-        logger.info(f"Extracted {len(self.raw_data)} records")
-        return self.raw_data
+        records = self._normalize_json_structure(data)
+        logger.info(f"Extracted {len(records)} records")
+        return records
+
+    def iter_records(self) -> Iterable[Dict]:
+        """
+        Get the records for a one-pass consumer without holding the file.
+        
+        JSON Lines files, and large JSON files when ijson is installed,
+        are streamed one record at a time. Anything else is parsed whole,
+        exactly as extract_from_json() does.
+        
+        Returns:
+            A generator of records when streaming, else the parsed list
+        """
+        if not self.input_path.is_file():
+            # Raise the usual not-found / not-a-file errors
+            return self.extract_from_json()
+        
+        self._check_large_file()
+        if is_ndjson(self.input_path):
+            logger.info(f"Streaming records from JSON Lines file: {self.input_path}")
+            return self._iter_ndjson_records()
+        
+        if self.is_large_file:
+            try:
+                import ijson  # noqa: F401
+            except ImportError:
+                return self.extract_from_json()
+            records = self._iter_ijson_records()
+            # Peek so an unrecognized layout falls back before anything is consumed
+            first = next(records, _NO_RECORD)
+            if first is not _NO_RECORD:
+                logger.info(f"Streaming records from large file: {self.input_path}")
+                return itertools.chain((first,), records)
+        
+        return self.extract_from_json()
+
+    def _extract_ndjson(self) -> List[Dict]:
+        """Extract data from a JSON Lines file (one object per line)."""
+        records = list(self._iter_ndjson_records())
+        logger.info(f"Extracted {len(records)} records from JSON Lines file")
+        return records
+
+    def _iter_ndjson_records(self) -> Generator[Dict, None, None]:
+        """Parse a JSON Lines file one line at a time, skipping blank lines."""
+        loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+        with open(self.input_path, 'rb') as f:
+            for line in f:
+                if line.strip():
+                    yield loads(line)
 
     def _extract_large_json(self) -> List[Dict]:
         """
-        Extract data from large JSON file using streaming.
-        Uses ijson if available, falls back to chunked reading.
-        Shows progress bar for user feedback.
+        Extract data from large JSON file.
+        Uses simdjson if available, then ijson streaming, then falls back
+        to chunked reading. Shows progress bar for user feedback.
         """
+        if SIMDJSON_AVAILABLE:
+            try:
+                return self._extract_with_simdjson()
+            except (ValueError, MemoryError) as e:
+                logger.warning(f"simdjson parsing failed ({e}), falling back to streaming parser")
+        
         try:
             import ijson
             return self._extract_with_ijson()
@@ -118,8 +306,63 @@ class DataExtractor:
             logger.warning("For better performance with large files, install ijson: pip install ijson")
             return self._extract_standard_json()
 
+    def _extract_with_simdjson(self) -> List[Dict]:
+        """
+        Extract data using simdjson, parsing straight from a memory map.
+        
+        Only the record list is converted to Python objects; for wrapper
+        objects the list is located on the parsed document first.
+        """
+        file_size = os.path.getsize(self.input_path)
+        logger.info(f"Using simdjson parser for large file ({file_size / (1024*1024):.1f} MB)")
+        print(f"    Parsing large file ({file_size / (1024*1024):.1f} MB)...")
+        
+        with open(self.input_path, 'rb') as f:
+            mm = self._map_file(f)
+            try:
+                with memoryview(mm) as buffer:
+                    doc = simdjson.Parser().parse(buffer)
+            finally:
+                mm.close()
+        
+        if isinstance(doc, simdjson.Array):
+            records = doc.as_list()
+        elif isinstance(doc, simdjson.Object):
+            key = next(
+                (k for k in WRAPPER_KEYS if isinstance(doc.get(k), simdjson.Array)),
+                None
+            )
+            if key is not None:
+                logger.info(f"Found data in '{key}' key")
+                records = doc[key].as_list()
+            else:
+                records = [doc.as_dict()]
+        else:
+            raise ValueError(f"Unexpected JSON type: {type(doc)}")
+        
+        logger.info(f"Parsed {len(records):,} records from large file")
+        print(f"    Loaded {len(records):,} records")
+        return records
+
     def _extract_with_ijson(self) -> List[Dict]:
         """Extract data using ijson streaming parser with progress bar."""
+        records = list(self._iter_ijson_records())
+        
+        if not records:
+            # Fallback to standard extraction
+            logger.warning("ijson streaming failed, using standard method")
+            return self._extract_standard_json()
+        
+        logger.info(f"Streamed {len(records):,} records from large file")
+        print(f"    Loaded {len(records):,} records")
+        return records
+
+    def _iter_ijson_records(self) -> Generator[Dict, None, None]:
+        """
+        Stream records from the input file with ijson, one at a time.
+        
+        Floats are parsed as float (not Decimal) to match the other parsers.
+        """
         import ijson
         
         # Try to import tqdm for progress bar
@@ -129,7 +372,6 @@ class DataExtractor:
         except ImportError:
             use_tqdm = False
         
-        records = []
         file_size = os.path.getsize(self.input_path)
         logger.info(f"Using ijson streaming parser for large file ({file_size / (1024*1024):.1f} MB)")
         print(f"    Streaming large file ({file_size / (1024*1024):.1f} MB)...")
@@ -148,63 +390,63 @@ class DataExtractor:
             record_count = 0
             last_pos = 0
             
-            # Try to detect the JSON structure
-            # First, try parsing as array items
-            try:
-                for record in ijson.items(f, 'item'):
-                    records.append(record)
-                    record_count += 1
-                    
-                    # Update progress bar
-                    if use_tqdm and record_count % 1000 == 0:
-                        current_pos = f.tell()
-                        pbar.update(current_pos - last_pos)
-                        last_pos = current_pos
+            # Sniff the structure once, then make exactly one items() pass
+            prefix = self._sniff_ijson_prefix(f)
+            f.seek(0)
+            
+            if prefix is not None:
+                try:
+                    for record in ijson.items(f, prefix, use_float=True):
+                        yield record
+                        record_count += 1
                         
-            except Exception:
-                # If that fails, try common nested structures
-                f.seek(0)
-                if use_tqdm:
-                    pbar.reset()
-                    last_pos = 0
-                    
-                for key in ['data.item', 'records.item', 'results.item']:
-                    try:
-                        for record in ijson.items(f, key):
-                            records.append(record)
-                            record_count += 1
-                            
-                            if use_tqdm and record_count % 1000 == 0:
-                                current_pos = f.tell()
-                                pbar.update(current_pos - last_pos)
-                                last_pos = current_pos
-                                
-                        if records:
-                            break
-                        f.seek(0)
-                        if use_tqdm:
-                            pbar.reset()
-                            last_pos = 0
-                    except Exception:
-                        f.seek(0)
-                        if use_tqdm:
-                            pbar.reset()
-                            last_pos = 0
-                        continue
+                        # Update progress bar
+                        if use_tqdm and record_count % 1000 == 0:
+                            current_pos = f.tell()
+                            pbar.update(current_pos - last_pos)
+                            last_pos = current_pos
+                except ijson.JSONError as e:
+                    raise json.JSONDecodeError(str(e), "", 0)
             
             if use_tqdm:
                 pbar.update(file_size - last_pos)  # Complete the progress bar
                 pbar.close()
+
+    def _sniff_ijson_prefix(self, f) -> Optional[str]:
+        """
+        Find the ijson prefix of the record list with a single event scan.
         
-        if not records:
-            # Fallback to standard extraction
-            logger.warning("ijson streaming failed, using standard method")
-            return self._extract_standard_json()
+        Top-level arrays stop at the first event. For objects only the
+        top-level keys are inspected, stopping at the first wrapper key
+        (see WRAPPER_KEYS) whose value is an array.
         
-        self.raw_data = records
-        logger.info(f"Streamed {len(self.raw_data):,} records from large file")
-        print(f"    Loaded {len(self.raw_data):,} records")
-        return self.raw_data
+        Returns:
+            'item', '<wrapper>.item', or None for a single object or
+            malformed input (the caller then falls back to standard loading)
+        """
+        import ijson
+        
+        events = ijson.parse(f)
+        try:
+            _, event, _ = next(events)
+            if event == 'start_array':
+                return 'item'
+            if event != 'start_map':
+                return None
+            
+            candidate = None
+            for prefix, event, value in events:
+                if candidate is not None and prefix == candidate:
+                    if event == 'start_array':
+                        return f"{candidate}.item"
+                    candidate = None
+                if prefix == '' and event == 'map_key':
+                    candidate = value if value in WRAPPER_KEYS else None
+                elif prefix == '' and event == 'end_map':
+                    return None
+        except (StopIteration, ijson.JSONError):
+            return None
+        return None
 
     def _normalize_json_structure(self, data) -> List[Dict]:
         """Normalize different JSON structures to a list of dicts."""
@@ -213,10 +455,10 @@ class DataExtractor:
             return data
         elif isinstance(data, dict):
             # Check for common wrapper keys
-            for key in ['data', 'records', 'results', 'items', 'rows']:
-                if key in data and isinstance(data[key], list):
-                    logger.info(f"Found data in '{key}' key: {len(data[key])} records")
-                    return data[key]
+            key = find_wrapper_key(data)
+            if key is not None:
+                logger.info(f"Found data in '{key}' key: {len(data[key])} records")
+                return data[key]
             # Single record
             logger.info("Single JSON object, converting to list")
             return [data]
@@ -232,6 +474,10 @@ class DataExtractor:
         
         This ensures clean CSV output without numpy array representations.
         """
+        return [self._convert_record_arrays(record) for record in data]
+
+    def _convert_record_arrays(self, record: Dict) -> Dict:
+        """Convert the arrays of a single record to CSV-friendly strings."""
         import numpy as np
         
         def process_value(value):
@@ -239,10 +485,6 @@ class DataExtractor:
             if value is None:
                 return None
             
-            # Handle numpy arrays
-            if isinstance(value, np.ndarray):
-                value = value.tolist()
-            
             # Handle lists/arrays
             if isinstance(value, list):
                 if not value:  # Empty list
@@ -253,33 +495,164 @@ class DataExtractor:
                 
                 # Array of primitives → pipe-separated
                 if isinstance(first_item, (str, int, float, bool)):
-                    return "|".join(str(v) for v in value)
+                    return "|".join(map(str, value))
                 
                 # Array of dicts/objects → JSON string
                 elif isinstance(first_item, dict):
-                    return json.dumps(value, ensure_ascii=False)
+                    return dumps_cell(value)
                 
                 # Nested arrays → JSON string
                 else:
-                    return json.dumps(value, ensure_ascii=False)
+                    return dumps_cell(value)
             
             # Handle nested dicts (will be flattened by json_normalize)
             elif isinstance(value, dict):
                 # Process nested values
                 return {k: process_value(v) for k, v in value.items()}
             
+            # Numpy arrays never come out of a JSON parse; test for them last
+            elif isinstance(value, np.ndarray):
+                return process_value(value.tolist())
+            
             return value
         
-        processed_data = []
-        for record in data:
-            processed_record = {}
-            for key, value in record.items():
-                processed_record[key] = process_value(value)
-            processed_data.append(processed_record)
+        return {key: process_value(value) for key, value in record.items()}
+
+    def _flatten_to_columns(self, data: List[Dict], sep: str = '.') -> Dict[str, list]:
+        """
+        Flatten records into column lists (structure-of-arrays).
+        
+        Nested dicts become dot-notation columns, placed after the top-level
+        scalar fields (same column order as pd.json_normalize).
+        Columns are pre-sized to the record count, with None where a record
+        lacks a field. Building the DataFrame from columns avoids pandas'
+        row-by-row dict transposition.
+        
+        Args:
+            data: List of records (arrays already converted to strings)
+            sep: Separator for nested keys
+            
+        Returns:
+            Dictionary mapping column name to list of values
+        """
+        n_rows = len(data)
+        columns: Dict[str, list] = {}
+        
+        def add_fields(obj: Dict, prefix: str, row_idx: int, nested: Optional[list] = None):
+            for key, value in obj.items():
+                full_key = f"{prefix}{key}"
+                if isinstance(value, dict):
+                    if nested is None:
+                        add_fields(value, full_key + sep, row_idx)
+                    else:
+                        nested.append((value, full_key + sep))
+                    continue
+                column = columns.get(full_key)
+                if column is None:
+                    column = columns[full_key] = [None] * n_rows
+                column[row_idx] = value
+        
+        for row_idx, record in enumerate(data):
+            # Top-level nested dicts are flattened after the scalar fields
+            nested = []
+            add_fields(record, "", row_idx, nested)
+            for value, prefix in nested:
+                add_fields(value, prefix, row_idx)
+        
+        return columns
+
+    def _flatten_record(self, record: Dict, sep: str = '.') -> Dict:
+        """
+        Flatten one record's nested dicts into dot-notation keys.
+        
+        Uses the same key order as _flatten_to_columns.
+        """
+        flat = {}
+        
+        def add_fields(obj: Dict, prefix: str):
+            for key, value in obj.items():
+                if isinstance(value, dict):
+                    add_fields(value, f"{prefix}{key}{sep}")
+                else:
+                    flat[f"{prefix}{key}"] = value
         
-        return processed_data
+        # Top-level nested dicts are flattened after the scalar fields
+        nested = []
+        for key, value in record.items():
+            if isinstance(value, dict):
+                nested.append((value, f"{key}{sep}"))
+            else:
+                flat[key] = value
+        for value, prefix in nested:
+            add_fields(value, prefix)
+        
+        return flat
 
-    def extract_to_dataframe(self) -> pd.DataFrame:
+    def _stream_to_columns(self, records: Iterable[Dict], sep: str = '.') -> Dict[str, list]:
+        """
+        Convert and flatten records one at a time into column lists.
+        
+        Unlike _flatten_to_columns, the record count is not known up front:
+        columns grow by appending, and a column first seen at row N is
+        back-filled with None. Records are never held in a list.
+        
+        Args:
+            records: Iterable of raw JSON records
+            sep: Separator for nested keys
+            
+        Returns:
+            Dictionary mapping column name to list of values
+        """
+        columns: Dict[str, list] = {}
+        n_rows = 0
+        
+        for record in records:
+            row = self._flatten_record(self._convert_record_arrays(record), sep)
+            for key, value in row.items():
+                column = columns.get(key)
+                if column is None:
+                    column = columns[key] = [None] * n_rows
+                column.append(value)
+            n_rows += 1
+            
+            # Pad the columns this record did not have
+            if len(row) < len(columns):
+                for column in columns.values():
+                    if len(column) < n_rows:
+                        column.append(None)
+        
+        return columns
+
+    def _stream_large_to_columns(self) -> Optional[Dict[str, list]]:
+        """
+        Stream a large file (ijson or JSON Lines) straight into column lists.
+        
+        Returns:
+            Column lists, or None if the input is not a large file, ijson
+            is not installed for a JSON document, or nothing could be streamed
+        """
+        if not self.input_path.is_file() or not self._check_large_file():
+            return None
+        
+        if is_ndjson(self.input_path):
+            records = self._iter_ndjson_records()
+        else:
+            try:
+                import ijson  # noqa: F401
+            except ImportError:
+                return None
+            records = self._iter_ijson_records()
+        
+        columns = self._stream_to_columns(records)
+        if not columns:
+            return None
+        
+        n_rows = len(next(iter(columns.values())))
+        logger.info(f"Streamed {n_rows:,} records into columns")
+        print(f"    Loaded {n_rows:,} records")
+        return columns
+
+    def extract_to_dataframe(self, keep_raw: bool = False) -> "pd.DataFrame":
         """
         Extract data and convert to pandas DataFrame.
         
@@ -287,33 +660,61 @@ class DataExtractor:
         1. Nested dicts → flattened with dot notation (department.manager.contact.email)
         2. Arrays of objects → JSON string (preserves data, can be parsed later)
         3. Arrays of primitives → pipe-separated string (CSV-friendly)
-        4. Uses Polars for fast deduplication in transformer (10x faster)
+        4. Duplicate rows are dropped in one hash pass in the transformer
+        
+        Args:
+            keep_raw: Keep the parsed records in raw_data after building the
+                DataFrame. By default only a summary for get_data_info is
+                kept and the file's entry is dropped from the parsed-file
+                cache, so the records are not held alongside the DataFrame.
         
         Returns:
             pandas DataFrame containing the extracted data with flattened columns
         """
+        import pandas as pd
+        
         logger.info("Extracting data to DataFrame with hybrid flatten approach")
         
         try:
-            data = self.extract_from_json()
+            # Large files: stream records into columns without a record list
+            # (halves peak memory; raw_data stays empty on this path)
+            columns = self._stream_large_to_columns()
             
-            if not data:
-                logger.warning("No data to convert to DataFrame")
-                return pd.DataFrame()
+            if columns is None:
+                data = self.extract_from_json()
+                
+                if not data:
+                    logger.warning("No data to convert to DataFrame")
+                    return pd.DataFrame()
+                
+                # Step 1: Pre-process arrays to strings (before json_normalize)
+                # This prevents numpy array representations in output
+                processed_data = self._convert_arrays_to_strings(data)
+                logger.debug("Pre-processed arrays to CSV-friendly strings")
+                
+                # Step 2: Flatten nested dicts straight into column lists
+                # This converts {"department": {"id": "D001", "manager": {"name": "John"}}}
+                # into columns: "department.id", "department.manager.name"
+                columns = self._flatten_to_columns(processed_data)
             
-            # Step 1: Pre-process arrays to strings (before json_normalize)
-            # This prevents numpy array representations in output
-            processed_data = self._convert_arrays_to_strings(data)
-            logger.debug("Pre-processed arrays to CSV-friendly strings")
+            # Step 3: Build the DataFrame column-wise (one dtype inference per column)
+            df = pd.DataFrame(columns)
+            del columns
             
-            # Step 2: Use json_normalize to flatten nested dicts
-            # This converts {"department": {"id": "D001", "manager": {"name": "John"}}}
-            # into columns: "department.id", "department.manager.name"
-            df = pd.json_normalize(processed_data, sep='.')
+            # Release the records unless the caller asked to keep them
+            if self.raw_data:
+                self._raw_meta = _RawMeta.from_records(self.raw_data)
+                if not keep_raw:
+                    self.raw_data = []
+                    if self.cache_parsed:
+                        _evict_parsed(self.input_path)
+            else:
+                self._raw_meta = _RawMeta(len(df))
             
             logger.info(f"Created DataFrame with shape: {df.shape}")
             logger.info(f"Columns after flattening: {len(df.columns)}")
-            logger.debug(f"DataFrame columns: {df.columns.tolist()}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"DataFrame columns: {df.columns.tolist()}")
             
             return df
             
@@ -321,6 +722,69 @@ class DataExtractor:
             logger.error(f"Error converting to DataFrame: {str(e)}")
             raise
 
+    def discover_columns(self, sep: str = '.') -> List[str]:
+        """
+        Collect the flattened column names of every record in one pass.
+        
+        Records come from iter_records(), so JSON Lines and large JSON
+        files are streamed and only the names are held. Columns are in
+        first-seen order, as in the DataFrame of extract_to_dataframe().
+        
+        Args:
+            sep: Separator for nested keys
+        
+        Returns:
+            Column names of the whole input
+        """
+        columns: Dict[str, None] = {}
+        # Records with the same top-level keys and no nested dicts have
+        # the same columns: flatten only one of them
+        seen_layouts = set()
+        for record in self.iter_records():
+            layout = tuple(record)
+            if layout in seen_layouts:
+                continue
+            if not any(type(value) is dict for value in record.values()):
+                seen_layouts.add(layout)
+            columns.update(dict.fromkeys(self._flatten_record(record, sep)))
+        return list(columns)
+
+    def iter_dataframes(self, chunksize: int = DATAFRAME_CHUNK_ROWS) -> Generator["pd.DataFrame", None, None]:
+        """
+        Yield the flattened records as DataFrames of at most chunksize rows.
+        
+        Records come from iter_records(), so JSON Lines and large JSON
+        files are never held whole; each chunk is flattened like
+        extract_to_dataframe(). Column sets and dtypes are per chunk and
+        may differ between chunks.
+        
+        Args:
+            chunksize: Maximum rows per DataFrame
+        
+        Yields:
+            One DataFrame per chunk of records
+        """
+        import pandas as pd
+        
+        if chunksize < 1:
+            raise ValueError(f"chunksize must be positive, got {chunksize}")
+        
+        records = iter(self.iter_records())
+        n_chunks = 0
+        while True:
+            batch = itertools.islice(records, chunksize)
+            first = next(batch, _NO_RECORD)
+            if first is _NO_RECORD:
+                break
+            columns = self._stream_to_columns(itertools.chain((first,), batch))
+            n_chunks += 1
+            df = pd.DataFrame(columns)
+            del columns
+            logger.debug("Built DataFrame chunk %d with shape %s", n_chunks, df.shape)
+            yield df
+        
+        logger.info(f"Extracted {n_chunks} DataFrame chunks of up to {chunksize:,} rows")
+
     def get_data_info(self) -> Dict:
         """
         Get information about the extracted data.
@@ -328,19 +792,61 @@ class DataExtractor:
         Returns:
             Dictionary with data statistics
         """
-        if not self.raw_data:
+        meta = _RawMeta.from_records(self.raw_data) if self.raw_data else self._raw_meta
+        if meta is None or not meta.record_count:
             return {"record_count": 0, "message": "No data extracted yet"}
 
         info = {
-            "record_count": len(self.raw_data),
-            "sample_record": self.raw_data[0] if self.raw_data else None,
+            "record_count": meta.record_count,
+            "sample_record": meta.sample_record,
             "file_path": str(self.input_path)
         }
 
-        if self.raw_data:
-            # Get keys from first record
-            if isinstance(self.raw_data[0], dict):
-                info["fields"] = list(self.raw_data[0].keys())
+        if meta.fields is not None:
+            # Keys from first record
+            info["fields"] = meta.fields
 
-        logger.debug(f"Data info: {info}")
+        logger.debug("Data info: %s", info)
         return info
+
+
+def _parsed_cache_key(path: Path) -> Tuple[str, int, int]:
+    """Cache key of a file version: an edited file gets a new key."""
+    st = path.stat()
+    return str(path.resolve()), st.st_mtime_ns, st.st_size
+
+
+def _read_standard_json_cached(extractor: DataExtractor) -> List[Dict]:
+    """
+    Parse a JSON file once per file version.
+    
+    The least recently used entries are dropped once the cached files
+    total more than PARSED_CACHE_MAX_MB of input.
+    """
+    key = _parsed_cache_key(extractor.input_path)
+    records = _parsed_cache.get(key)
+    if records is not None:
+        _parsed_cache.move_to_end(key)
+        return records
+    
+    records = extractor._read_standard_json()
+    max_bytes = PARSED_CACHE_MAX_MB * 1024 * 1024
+    if key[2] <= max_bytes:
+        _parsed_cache[key] = records
+        while sum(size for _, _, size in _parsed_cache) > max_bytes:
+            _parsed_cache.popitem(last=False)
+    return records
+
+
+def _evict_parsed(path: Path) -> None:
+    """Drop a file's parsed records from the cache, if they are cached."""
+    try:
+        key = _parsed_cache_key(path)
+    except OSError:
+        return
+    _parsed_cache.pop(key, None)
+
+
+def clear_parsed_cache() -> None:
+    """Drop every parsed file kept by DataExtractor(cache_parsed=True)."""
+    _parsed_cache.clear()
@@ -0,0 +1,137 @@
+"""
+JSON Utilities Module
+Shared helpers for locating the record list inside parsed JSON documents,
+detecting JSON Lines input and serializing nested values into CSV cells.
+"""
+
+import json
+from pathlib import Path
+from typing import Any, List, Optional, Union
+
+# Wrapper keys that commonly hold the record list, in priority order
+WRAPPER_KEYS = ('data', 'records', 'results', 'items', 'rows')
+_WRAPPER_KEY_SET = frozenset(WRAPPER_KEYS)
+
+# Bytes read from the start of a file to detect JSON Lines input (64 KB)
+NDJSON_SNIFF_BYTES = 64 * 1024
+
+# Exact types of JSON scalars; a set lookup on type(value) lets hot loops
+# skip the isinstance chain for the common (leaf) case
+SCALAR_TYPES = frozenset((str, int, float, bool, type(None)))
+
+# json.dumps(..., ensure_ascii=False) builds a new encoder on every call
+_CELL_ENCODER = json.JSONEncoder(ensure_ascii=False)
+
+
+def find_wrapper_key(data: dict) -> Optional[str]:
+    """
+    Find the wrapper key holding the record list.
+    
+    Args:
+        data: Parsed top-level JSON object
+    
+    Returns:
+        First key from WRAPPER_KEYS whose value is a list, or None
+    """
+    # One set intersection rules out most objects; priority order only
+    # matters when several wrapper keys are present
+    present = data.keys() & _WRAPPER_KEY_SET
+    if not present:
+        return None
+    return next(
+        (key for key in WRAPPER_KEYS if key in present and isinstance(data[key], list)),
+        None
+    )
+
+
+def unwrap_records(data: Any) -> List:
+    """
+    Normalize a parsed JSON document to a list of records.
+    
+    Arrays are returned as-is, objects with a wrapper key return the wrapped
+    list, and any other object becomes a single-record list.
+    
+    Args:
+        data: Parsed JSON document
+    
+    Returns:
+        List of records
+    
+    Raises:
+        ValueError: If the document is neither an array nor an object
+    """
+    if isinstance(data, list):
+        return data
+    if isinstance(data, dict):
+        key = find_wrapper_key(data)
+        return data[key] if key is not None else [data]
+    raise ValueError(f"Unexpected JSON type: {type(data)}")
+
+
+def is_ndjson(path: Union[str, Path]) -> bool:
+    """
+    Detect newline-delimited JSON (JSON Lines, one object per line).
+    
+    Only the first NDJSON_SNIFF_BYTES are read: the first line must be a
+    complete JSON object and the next non-blank line must start another.
+    Pretty-printed documents and single-line files are not NDJSON.
+    
+    Args:
+        path: Path to the input file
+    
+    Returns:
+        True if the file looks like JSON Lines
+    """
+    with open(path, 'rb') as f:
+        head = f.read(NDJSON_SNIFF_BYTES).lstrip()
+    
+    if not head.startswith(b'{'):
+        return False
+    first_line, newline, rest = head.partition(b'\n')
+    if not newline or not rest.lstrip().startswith(b'{'):
+        return False
+    try:
+        json.loads(first_line)
+    except ValueError:
+        return False
+    return True
+
+
+def dumps_cell(value: Any) -> str:
+    """
+    Serialize a nested value to a JSON string for a CSV cell.
+    
+    Same output as json.dumps(value, ensure_ascii=False), using one shared
+    encoder instead of constructing one per call.
+    
+    Args:
+        value: List or dict to serialize
+    
+    Returns:
+        JSON string
+    """
+    return _CELL_ENCODER.encode(value)
+
+
+def dumps_cell_head(value: Any, length: int) -> str:
+    """
+    Return the first length characters of dumps_cell(value).
+    
+    The value is encoded incrementally and encoding stops once enough text
+    exists, so a long array is not serialized just to be cut short.
+    
+    Args:
+        value: List or dict to serialize
+        length: Number of characters wanted
+    
+    Returns:
+        JSON string prefix (the whole string if it is shorter)
+    """
+    pieces = []
+    size = 0
+    for chunk in _CELL_ENCODER.iterencode(value):
+        pieces.append(chunk)
+        size += len(chunk)
+        if size >= length:
+            break
+    return "".join(pieces)[:length]
@@ -11,8 +11,22 @@ import logging
 from tqdm import tqdm
 import time
 
+# Try to import pyarrow for the multithreaded CSV writer
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# CSV writer engines accepted by load_to_csv
+CSV_ENGINES = ("pandas", "pyarrow")
+
+# Write buffer for chunked CSV output (1 MB)
+WRITE_BUFFER_SIZE = 1 << 20
+
 
 class DataLoader:
     """
@@ -32,7 +46,7 @@ class DataLoader:
         
         # Create output directory if it doesn't exist
         self.output_dir.mkdir(parents=True, exist_ok=True)
-        logger.debug(f"Output directory ensured: {self.output_dir}")
+        logger.debug("Output directory ensured: %s", self.output_dir)
 
     def generate_output_filename(
         self,
@@ -57,7 +71,7 @@ class DataLoader:
         else:
             filename = f"{base_name}{extension}"
         
-        logger.debug(f"Generated output filename: {filename}")
+        logger.debug("Generated output filename: %s", filename)
         return filename
 
     def load_to_csv(
@@ -67,6 +81,9 @@ class DataLoader:
         add_timestamp: bool = True,
         encoding: str = "utf-8",
         index: bool = False,
+        engine: str = "pandas",
+        mode: str = "w",
+        header: bool = True,
         **csv_kwargs
     ) -> Path:
         """
@@ -78,6 +95,14 @@ class DataLoader:
             add_timestamp: Whether to add timestamp to filename
             encoding: File encoding (default: utf-8)
             index: Whether to write row indices
+            engine: CSV writer, "pandas" (default) or "pyarrow". The pyarrow
+                writer is multithreaded but formats differently (quoted
+                strings, lowercase booleans, 1.0 written as 1); it falls back
+                to pandas for non-UTF-8 output, csv_kwargs other than sep, or columns
+                Arrow cannot type.
+            mode: "w" to create/overwrite the file, "a" to append to it
+                (for writing a stream of chunks to one file)
+            header: Whether to write the column names first
             **csv_kwargs: Additional arguments for pandas to_csv()
         
         Returns:
@@ -112,34 +137,45 @@ class DataLoader:
             logger.info(f"Writing DataFrame to: {self.output_file}")
             total_rows = len(df)
             
-            if total_rows > 50000:
+            if engine not in CSV_ENGINES:
+                raise ValueError(f"Unknown CSV engine: {engine}")
+            if mode not in ("w", "a"):
+                raise ValueError(f"Unknown write mode: {mode}")
+            
+            if engine == "pyarrow" and self._write_csv_arrow(df, encoding, index, csv_kwargs, mode, header):
+                logger.debug("CSV written with pyarrow writer")
+            elif total_rows > 50000:
                 # Chunked writing with progress bar for large files
                 chunk_size = 10000
                 print(f"    ├─ Writing {total_rows:,} rows to CSV")
                 
-                # Write header first
-                df.head(0).to_csv(self.output_file, encoding=encoding, index=index, **csv_kwargs)
-                
-                # Write data in chunks with progress
-                with tqdm(total=total_rows, desc="        Writing", 
-                          unit="rows", bar_format="{l_bar}{bar}| {n_fmt}/{total_fmt} [{elapsed}<{remaining}]") as pbar:
-                    for start in range(0, total_rows, chunk_size):
-                        end = min(start + chunk_size, total_rows)
-                        df.iloc[start:end].to_csv(
-                            self.output_file,
-                            mode='a',
-                            header=False,
-                            encoding=encoding,
-                            index=index,
-                            **csv_kwargs
-                        )
-                        pbar.update(end - start)
+                # Open once with a 1 MB buffer; chunks append to the same handle
+                with open(self.output_file, mode, buffering=WRITE_BUFFER_SIZE,
+                          encoding=encoding, newline='') as fh:
+                    # Write header first
+                    if header:
+                        df.head(0).to_csv(fh, index=index, **csv_kwargs)
+                    
+                    # Write data in chunks with progress
+                    with tqdm(total=total_rows, desc="        Writing", 
+                              unit="rows", bar_format="{l_bar}{bar}| {n_fmt}/{total_fmt} [{elapsed}<{remaining}]") as pbar:
+                        for start in range(0, total_rows, chunk_size):
+                            end = min(start + chunk_size, total_rows)
+                            df.iloc[start:end].to_csv(
+                                fh,
+                                header=False,
+                                index=index,
+                                **csv_kwargs
+                            )
+                            pbar.update(end - start)
                 print("        ✓ Write complete")
             else:
                 # Standard write for smaller files
                 print(f"    ├─ Writing {total_rows:,} rows...", end=" ", flush=True)
                 df.to_csv(
                     self.output_file,
+                    mode=mode,
+                    header=header,
                     encoding=encoding,
                     index=index,
                     **csv_kwargs
@@ -161,6 +197,45 @@ class DataLoader:
             logger.error(error_msg)
             raise IOError(error_msg)
 
+    def _write_csv_arrow(
+        self,
+        df: pd.DataFrame,
+        encoding: str,
+        index: bool,
+        csv_kwargs: dict,
+        mode: str = "w",
+        header: bool = True
+    ) -> bool:
+        """
+        Write the DataFrame with pyarrow's CSV writer.
+        
+        Returns:
+            True if the file was written, False if the caller should fall
+            back to the pandas writer
+        """
+        if not PYARROW_AVAILABLE:
+            logger.warning("pyarrow not installed. Using pandas CSV writer.")
+            return False
+        # sep maps onto the Arrow delimiter; other to_csv options have no equivalent
+        options = dict(csv_kwargs)
+        delimiter = options.pop("sep", ",")
+        if options or len(delimiter) != 1 or encoding.lower().replace("-", "") != "utf8":
+            logger.warning("pyarrow CSV writer supports UTF-8 with a one-character sep only. Using pandas.")
+            return False
+        
+        try:
+            table = pa.Table.from_pandas(df, preserve_index=index)
+        except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+            logger.warning(f"Cannot convert DataFrame to Arrow ({e}). Using pandas CSV writer.")
+            return False
+        
+        print(f"    ├─ Writing {len(df):,} rows (pyarrow)...", end=" ", flush=True)
+        write_options = pacsv.WriteOptions(include_header=header, batch_size=65536, delimiter=delimiter)
+        with open(self.output_file, mode + "b") as fh:
+            pacsv.write_csv(table, fh, write_options=write_options)
+        print("✓")
+        return True
+
     def load_to_multiple_formats(
         self,
         df: pd.DataFrame,
@@ -232,5 +307,5 @@ class DataLoader:
             ).strftime("%Y-%m-%d %H:%M:%S")
         }
         
-        logger.debug(f"Output file info: {info}")
+        logger.debug("Output file info: %s", info)
         return info
@@ -5,11 +5,20 @@ Sets up logging for the entire pipeline with file rotation and proper formatting
 
 import logging
 import logging.handlers
+import multiprocessing.util
 import os
+import queue
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional
 import yaml
 
+# Background listeners that own each logger's file handler, by logger name
+_listeners: Dict[str, logging.handlers.QueueListener] = {}
+
+# Process that started each listener (a forked worker inherits the dict,
+# but not the listener thread)
+_listener_pids: Dict[str, int] = {}
+
 
 def setup_logger(
     name: str,
@@ -43,7 +52,8 @@ def setup_logger(
     logger = logging.getLogger(name)
     logger.setLevel(getattr(logging, level.upper()))
     
-    # Prevent duplicate handlers
+    # Prevent duplicate handlers (and stop the listener of a previous setup)
+    shutdown_logger(name)
     if logger.handlers:
         logger.handlers.clear()
     
@@ -53,6 +63,11 @@ def setup_logger(
     
     formatter = logging.Formatter(log_format)
     
+    # Worker processes (batch runs) each write their own file: several
+    # processes rotating one file would race and lose records
+    if multiprocessing.parent_process() is not None:
+        log_file = f"{Path(log_file).stem}.{os.getpid()}{Path(log_file).suffix}"
+    
     # File handler with rotation
     file_handler = logging.handlers.RotatingFileHandler(
         filename=log_path / log_file,
@@ -62,9 +77,20 @@ def setup_logger(
     )
     file_handler.setLevel(logging.DEBUG)
     file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
     
-    # Console handler
+    # File writes happen on a background thread: the logging call only
+    # enqueues the record, the listener does the formatting and the write
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, file_handler, respect_handler_level=True)
+    listener.start()
+    _listeners[name] = listener
+    _listener_pids[name] = os.getpid()
+    # Flush on interpreter exit, including in multiprocessing workers
+    # (which skip atexit but run multiprocessing finalizers)
+    multiprocessing.util.Finalize(None, shutdown_logger, args=(name,), exitpriority=10)
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    
+    # Console handler (synchronous, so messages stay in order with print output)
     console_handler = logging.StreamHandler()
     console_handler.setLevel(getattr(logging, level.upper()))
     console_handler.setFormatter(formatter)
@@ -73,6 +99,37 @@ def setup_logger(
     return logger
 
 
+def shutdown_logger(name: Optional[str] = None) -> None:
+    """
+    Stop background log listeners, flushing queued records to disk.
+    
+    Args:
+        name: Logger whose listener to stop (default: all listeners)
+    """
+    names = [name] if name is not None else list(_listeners)
+    for logger_name in names:
+        listener = _listeners.pop(logger_name, None)
+        _listener_pids.pop(logger_name, None)
+        if listener is not None:
+            listener.stop()
+            for handler in listener.handlers:
+                handler.close()
+
+
+def is_logger_running(name: str) -> bool:
+    """
+    Check whether a logger set up by setup_logger still writes its log file.
+    
+    Args:
+        name: Logger name
+    
+    Returns:
+        False once shutdown_logger has stopped the logger's listener, or
+        in a worker process that inherited the listener from its parent
+    """
+    return _listener_pids.get(name) == os.getpid()
+
+
 def load_config(config_path: str = "config/config.yaml") -> dict:
     """
     Load configuration from YAML file.
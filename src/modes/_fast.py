@@ -0,0 +1,76 @@
+"""
+Compiled Fast Paths
+Optional Numba kernels for the hot serialization loops of the modes.
+"""
+
+import numpy as np
+
+# Try to import numba for compiled integer joins
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Below this length str.join wins over the list -> int64 array copy
+NUMBA_MIN_LENGTH = 64
+
+_INT_ONLY = {int}
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _join_int64(arr):
+        """Write arr as pipe-separated decimal ASCII into a byte buffer."""
+        # 20 digits + sign covers the int64 range; one separator per gap
+        out = np.empty(arr.size * 21, np.uint8)
+        digits = np.empty(20, np.uint8)
+        ten = np.uint64(10)
+        pos = 0
+        for i in range(arr.size):
+            if i:
+                out[pos] = 124  # '|'
+                pos += 1
+            x = arr[i]
+            # Magnitude as uint64 so the int64 minimum does not overflow
+            u = np.uint64(x)
+            if x < 0:
+                out[pos] = 45  # '-'
+                pos += 1
+                u = ~u + np.uint64(1)
+            n = 0
+            while True:
+                digits[n] = 48 + np.uint8(u % ten)
+                n += 1
+                u //= ten
+                if u == 0:
+                    break
+            for j in range(n - 1, -1, -1):
+                out[pos] = digits[j]
+                pos += 1
+        return out[:pos]
+
+
+def join_primitives(values: list) -> str:
+    """
+    Join an array of primitives with "|", as "|".join(map(str, values)).
+
+    Long all-int lists run through a compiled itoa loop when Numba is
+    installed. Anything else (bools, floats, strings, mixed types, ints
+    outside int64) takes the str() path.
+
+    Args:
+        values: List of primitive values
+
+    Returns:
+        Pipe-separated string ("" for an empty list)
+    """
+    if (NUMBA_AVAILABLE and len(values) >= NUMBA_MIN_LENGTH
+            and set(map(type, values)) == _INT_ONLY):
+        try:
+            arr = np.array(values, dtype=np.int64)
+        except OverflowError:
+            pass
+        else:
+            return _join_int64(arr).tobytes().decode("ascii")
+    return "|".join(map(str, values))
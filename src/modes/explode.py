@@ -3,12 +3,14 @@ Explode Conversion Mode
 Fully explodes nested arrays - one row per deepest nested item.
 """
 
-import json
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterable, List, Any, Optional, Sized
 import logging
 
+from src.json_utils import SCALAR_TYPES, dumps_cell
+from src.modes._fast import join_primitives
+
 logger = logging.getLogger(__name__)
 
 
@@ -27,17 +29,23 @@ class ExplodeConverter:
     def __init__(self):
         self.mode_name = "explode"
     
-    def convert(self, data: List[Dict]) -> Dict[str, pd.DataFrame]:
+    def convert(self, data: Iterable[Dict]) -> Dict[str, pd.DataFrame]:
         """
         Convert JSON data to fully exploded DataFrame.
         
+        Records are consumed one at a time, so ``data`` may be a stream
+        (e.g. DataExtractor.iter_records()); only the exploded rows are held.
+        
         Args:
-            data: List of JSON records
+            data: List or iterable of JSON records
             
         Returns:
             Dict with single key 'main' containing the exploded DataFrame
         """
-        logger.info(f"Converting {len(data)} records using EXPLODE mode")
+        if isinstance(data, Sized):
+            logger.info(f"Converting {len(data)} records using EXPLODE mode")
+        else:
+            logger.info("Converting streamed records using EXPLODE mode")
         
         all_rows = []
         for record in data:
@@ -67,73 +75,84 @@ class ExplodeConverter:
         for key, value in record.items():
             full_key = f"{prefix}{key}" if prefix else key
             
-            if isinstance(value, np.ndarray):
-                value = value.tolist()
+            if type(value) in SCALAR_TYPES:
+                flat_fields[full_key] = value
+                continue
             
             if isinstance(value, dict):
-                # Flatten nested dict
-                nested_flat = self._flatten_dict(value, full_key + ".")
-                flat_fields.update(nested_flat)
-                
-            elif isinstance(value, list) and value and isinstance(value[0], dict):
+                # Flatten nested dict straight into this row
+                self._flatten_dict(value, full_key + ".", flat_fields)
+                continue
+            
+            if not isinstance(value, list):
+                # Numpy arrays never come out of a JSON parse; test for them last
+                if isinstance(value, np.ndarray):
+                    value = value.tolist()
+                if not isinstance(value, list):
+                    flat_fields[full_key] = value
+                    continue
+            
+            if value and isinstance(value[0], dict):
                 # Array of objects - need to explode
                 arrays_to_explode.append((full_key, value))
-                
-            elif isinstance(value, list):
-                # Array of primitives - join with pipe
-                flat_fields[full_key] = "|".join(str(v) for v in value) if value else ""
-                
             else:
-                flat_fields[full_key] = value
+                # Array of primitives - join with pipe
+                flat_fields[full_key] = join_primitives(value)
         
         # If no arrays to explode, return single row
         if not arrays_to_explode:
             return [flat_fields]
         
-        # Explode arrays one by one
-        rows = [flat_fields]
+        # Explode each array's items once, then take the cross product
+        # (first array varies slowest, matching the nested-loop order)
+        sub_lists = [
+            [
+                exploded_item
+                for item in array_items
+                for exploded_item in self._explode_record(item, f"{array_name}.")
+            ]
+            for array_name, array_items in arrays_to_explode
+        ]
         
-        for array_name, array_items in arrays_to_explode:
-            new_rows = []
-            
-            for base_row in rows:
-                for item in array_items:
-                    # Clone base row
-                    row = base_row.copy()
-                    
-                    # Recursively explode the array item
-                    exploded_items = self._explode_record(item, f"{array_name}.")
-                    
-                    for exploded_item in exploded_items:
-                        final_row = row.copy()
-                        final_row.update(exploded_item)
-                        new_rows.append(final_row)
-            
-            rows = new_rows
+        # Merge level by level: each row is built with one dict merge, and
+        # the partial rows of the outer arrays are shared by their children
+        rows = [flat_fields]
+        for sub_list in sub_lists:
+            rows = [{**base, **part} for base in rows for part in sub_list]
         
         return rows
     
-    def _flatten_dict(self, d: Dict, prefix: str = "") -> Dict:
-        """Flatten a nested dictionary with dot notation."""
-        flat = {}
+    def _flatten_dict(self, d: Dict, prefix: str = "", flat: Optional[Dict] = None) -> Dict:
+        """
+        Flatten a nested dictionary with dot notation.
+        
+        Writes into ``flat`` when given (no intermediate dict per level)
+        and returns it.
+        """
+        if flat is None:
+            flat = {}
         
         for key, value in d.items():
             full_key = f"{prefix}{key}"
             
-            if isinstance(value, np.ndarray):
-                value = value.tolist()
+            if type(value) in SCALAR_TYPES:
+                flat[full_key] = value
+                continue
             
             if isinstance(value, dict):
-                flat.update(self._flatten_dict(value, full_key + "."))
+                self._flatten_dict(value, full_key + ".", flat)
                 
             elif isinstance(value, list):
                 if value and isinstance(value[0], dict):
                     # Keep as JSON for nested arrays within dicts
-                    flat[full_key] = json.dumps(value, ensure_ascii=False)
+                    flat[full_key] = dumps_cell(value)
                 elif value:
-                    flat[full_key] = "|".join(str(v) for v in value)
+                    flat[full_key] = join_primitives(value)
                 else:
                     flat[full_key] = ""
+            elif isinstance(value, np.ndarray):
+                # Numpy arrays never come out of a JSON parse; re-dispatch as a list
+                self._flatten_dict({key: value.tolist()}, prefix, flat)
             else:
                 flat[full_key] = value
         
@@ -3,15 +3,121 @@ Flat Conversion Mode
 Nested dicts are flattened, arrays of objects become JSON strings.
 """
 
-import json
+import csv
+import functools
+import itertools
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Any
+from typing import Callable, Dict, Iterable, List, Any, Optional, Sequence, Tuple
 from pathlib import Path
 import logging
 
+from src.json_utils import SCALAR_TYPES, dumps_cell
+from src.loader import WRITE_BUFFER_SIZE
+from src.modes._fast import join_primitives
+
 logger = logging.getLogger(__name__)
 
+# Records whose columns make up the header in convert_to_csv
+HEADER_SAMPLE_SIZE = 64
+
+# Records flattened per batch when convert() is given a stream
+STREAM_CHUNK_RECORDS = 50_000
+
+
+def _record_shape(obj: Dict) -> Optional[tuple]:
+    """
+    Describe a record's key structure as nested tuples.
+    
+    Each entry is (key, child shape) for nested dicts or (key, None) for
+    leaf values. Returns None if any key is not a string.
+    """
+    shape = []
+    for key, value in obj.items():
+        if type(key) is not str:
+            return None
+        if isinstance(value, dict):
+            child = _record_shape(value)
+            if child is None:
+                return None
+            shape.append((key, child))
+        else:
+            shape.append((key, None))
+    return tuple(shape)
+
+
+@functools.lru_cache(maxsize=32)
+def _compile_row_writer(shape: tuple, sep: str) -> Tuple[Optional[Callable], Tuple[str, ...]]:
+    """
+    Generate straight-line code that flattens records of one exact shape.
+    
+    The generated writer reads every leaf by literal key and stores it in
+    its column with no dict iteration or key building. It returns False,
+    leaving the row to the generic walker, as soon as a record deviates:
+    different key count, a missing key, a non-dict where a dict was seen,
+    or a dict where a leaf was seen.
+    
+    Returns:
+        Tuple of (factory, column keys). The factory takes the scalar type
+        set, the value converter and one column list per key, in order.
+        (None, ()) if the shape cannot be specialized.
+    """
+    # Column keys in the generic walker's creation order
+    column_keys: List[str] = []
+    
+    def collect(node: tuple, prefix: str, top: bool):
+        nested = []
+        for key, child in node:
+            if child is None:
+                column_keys.append(prefix + key)
+            elif top:
+                nested.append((child, prefix + key + sep))
+            else:
+                collect(child, prefix + key + sep, False)
+        for child, child_prefix in nested:
+            collect(child, child_prefix, False)
+    
+    collect(shape, "", True)
+    if len(set(column_keys)) != len(column_keys):
+        # Colliding flattened keys: write order would matter, stay generic
+        return None, ()
+    
+    index = {key: i for i, key in enumerate(column_keys)}
+    dict_vars = itertools.count(1)
+    body: List[str] = []
+    
+    def emit(var: str, node: tuple, prefix: str):
+        body.append(f"if len({var}) != {len(node)}: return False")
+        for key, child in node:
+            full_key = prefix + key
+            if child is None:
+                col = f"c{index[full_key]}"
+                body.append(f"x = {var}[{key!r}]")
+                body.append(f"if type(x) in S: {col}[row] = x")
+                body.append("elif isinstance(x, dict): return False")
+                body.append(f"else: {col}[row] = pv(x)")
+            else:
+                child_var = f"d{next(dict_vars)}"
+                body.append(f"{child_var} = {var}[{key!r}]")
+                body.append(f"if type({child_var}) is not dict: return False")
+                emit(child_var, child, full_key + sep)
+    
+    emit("r", shape, "")
+    params = "".join(f", c{i}" for i in range(len(column_keys)))
+    source = "\n".join(
+        [f"def make(S, pv{params}):",
+         "    def write(r, row):",
+         "        try:"]
+        + [f"            {line}" for line in body]
+        + ["        except KeyError:",
+           "            return False",
+           "        return True",
+           "    return write"]
+    )
+    namespace: Dict[str, Any] = {}
+    exec(compile(source, "<flat-row-writer>", "exec"), namespace)
+    return namespace["make"], tuple(column_keys)
+
 
 class FlatConverter:
     """
@@ -26,52 +132,229 @@ class FlatConverter:
     def __init__(self):
         self.mode_name = "flat"
     
-    def convert(self, data: List[Dict]) -> Dict[str, pd.DataFrame]:
+    def convert(self, data: Iterable[Dict]) -> Dict[str, pd.DataFrame]:
         """
         Convert JSON data to flat DataFrame.
         
+        ``data`` may be a stream (e.g. DataExtractor.iter_records()): it is
+        then flattened in batches, so the raw records are never all held.
+        
         Args:
-            data: List of JSON records
+            data: List or iterable of JSON records
             
         Returns:
             Dict with single key 'main' containing the DataFrame
         """
-        logger.info(f"Converting {len(data)} records using FLAT mode")
-        
-        # Pre-process arrays
-        processed_data = self._convert_arrays_to_strings(data)
+        if isinstance(data, Sequence):
+            logger.info(f"Converting {len(data)} records using FLAT mode")
+            # Convert arrays and flatten nested dicts in one pass
+            columns = self._flatten_to_columns(data)
+            n_rows = len(data)
+        else:
+            logger.info("Converting streamed records using FLAT mode")
+            columns, n_rows = self._stream_to_columns(data)
         
-        # Flatten nested dicts
-        df = pd.json_normalize(processed_data, sep='.')
+        # Explicit index keeps one row per record even with no columns
+        df = pd.DataFrame(columns, index=pd.RangeIndex(n_rows))
         
         logger.info(f"Created flat DataFrame: {df.shape[0]} rows, {df.shape[1]} columns")
         return {"main": df}
     
-    def _convert_arrays_to_strings(self, data: List[Dict]) -> List[Dict]:
-        """Convert arrays to CSV-friendly strings."""
-        processed = []
+    def convert_to_csv(
+        self,
+        data: Iterable[Dict],
+        path: str,
+        encoding: str = "utf-8",
+        header_sample: Optional[int] = HEADER_SAMPLE_SIZE
+    ) -> int:
+        """
+        Write flat CSV rows straight from the records, without a DataFrame.
+        
+        Each record is flattened and written as it is read, so only the
+        header sample is held in memory. The header is the union of the
+        columns of the first ``header_sample`` records, in convert()'s
+        column order. No deduplication is done, and values are written as
+        they are (an int column with gaps stays "1", not "1.0").
+        
+        Args:
+            data: Iterable of JSON records
+            path: Output CSV path
+            encoding: File encoding
+            header_sample: Records to sniff the header from (None = all)
+            
+        Returns:
+            Number of rows written
+            
+        Raises:
+            ValueError: If a record past the sample has a column not in the header
+        """
+        records = iter(data)
+        sample = [self._flatten_one(record) for record in itertools.islice(records, header_sample)]
+        header = list(dict.fromkeys(key for row in sample for key in row))
+        
+        with open(path, 'w', encoding=encoding, buffering=WRITE_BUFFER_SIZE, newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=header)
+            writer.writeheader()
+            writer.writerows(sample)
+            row_count = len(sample)
+            for record in records:
+                writer.writerow(self._flatten_one(record))
+                row_count += 1
+        
+        logger.info(f"Wrote {row_count} flat rows to {path}")
+        return row_count
+    
+    def _flatten_one(self, record: Dict, sep: str = '.') -> Dict[str, Any]:
+        """Flatten a single record into a CSV-ready row (convert()'s column order)."""
+        row: Dict[str, Any] = {}
+        process_value = self._process_value
         
-        for record in data:
-            processed.append(self._process_record(record))
+        def add_fields(obj: Dict, prefix: str, nested: Optional[list] = None):
+            for key, value in obj.items():
+                full_key = f"{prefix}{key}"
+                if type(value) not in SCALAR_TYPES:
+                    if isinstance(value, dict):
+                        if nested is None:
+                            add_fields(value, full_key + sep)
+                        else:
+                            nested.append((value, full_key + sep))
+                        continue
+                    value = process_value(value)
+                row[full_key] = value
         
-        return processed
+        nested = []
+        add_fields(record, "", nested)
+        for value, prefix in nested:
+            add_fields(value, prefix)
+        return row
     
-    def _process_record(self, record: Dict) -> Dict:
-        """Process a single record, converting arrays."""
-        result = {}
+    def _flatten_to_columns(self, data: List[Dict], sep: str = '.') -> Dict[str, list]:
+        """
+        Walk each record once, writing CSV-ready values into column lists.
         
-        for key, value in record.items():
-            result[key] = self._process_value(value)
+        Fuses array-to-string conversion with dict flattening, so records
+        are not rebuilt and then re-walked by pd.json_normalize. Column
+        order matches pd.json_normalize: top-level scalars first, then
+        nested dict fields.
         
-        return result
+        Args:
+            data: List of JSON records
+            sep: Separator for nested keys
+            
+        Returns:
+            Dictionary mapping column name to list of values (pre-sized,
+            None where a record lacks the field)
+        """
+        n_rows = len(data)
+        columns: Dict[str, list] = {}
+        process_value = self._process_value
+        
+        def add_fields(obj: Dict, prefix: str, row_idx: int, nested: Optional[list] = None):
+            for key, value in obj.items():
+                full_key = f"{prefix}{key}"
+                # Scalars (the common case) skip the isinstance chain
+                if type(value) not in SCALAR_TYPES:
+                    if isinstance(value, dict):
+                        if nested is None:
+                            add_fields(value, full_key + sep, row_idx)
+                        else:
+                            nested.append((value, full_key + sep))
+                        continue
+                    value = process_value(value)
+                column = columns.get(full_key)
+                if column is None:
+                    column = columns[full_key] = [None] * n_rows
+                column[row_idx] = value
+        
+        # Records shaped like the first one take a compiled fast path
+        write_row = self._specialize(data[0], columns, n_rows, sep) if data else None
+        
+        for row_idx, record in enumerate(data):
+            if write_row is not None and write_row(record, row_idx):
+                continue
+            # Top-level nested dicts are flattened after the scalar fields
+            nested = []
+            add_fields(record, "", row_idx, nested)
+            for value, prefix in nested:
+                add_fields(value, prefix, row_idx)
+        
+        return columns
     
-    def _process_value(self, value: Any) -> Any:
-        """Process a value, handling arrays and nested structures."""
-        if value is None:
+    def _stream_to_columns(self, records: Iterable[Dict], sep: str = '.') -> Tuple[Dict[str, list], int]:
+        """
+        Flatten a stream of records into column lists, one batch at a time.
+        
+        Each batch of STREAM_CHUNK_RECORDS goes through _flatten_to_columns
+        and its columns are appended to the running ones (None-padded),
+        giving the same columns, order and values as a single pass.
+        
+        Returns:
+            Tuple of (column lists, number of rows)
+        """
+        columns: Dict[str, list] = {}
+        n_rows = 0
+        records = iter(records)
+        
+        while True:
+            batch = list(itertools.islice(records, STREAM_CHUNK_RECORDS))
+            if not batch:
+                break
+            for key, values in self._flatten_to_columns(batch, sep).items():
+                column = columns.get(key)
+                if column is None:
+                    columns[key] = [None] * n_rows + values
+                else:
+                    column.extend(values)
+            n_rows += len(batch)
+            del batch
+            
+            # Pad the columns this batch did not have
+            for column in columns.values():
+                if len(column) < n_rows:
+                    column.extend(itertools.repeat(None, n_rows - len(column)))
+        
+        return columns, n_rows
+    
+    def _specialize(
+        self,
+        record: Dict,
+        columns: Dict[str, list],
+        n_rows: int,
+        sep: str
+    ) -> Optional[Callable[[Dict, int], bool]]:
+        """
+        Build a row writer specialized to this record's shape.
+        
+        Creates the record's columns up front (the same columns, in the
+        same order, the generic walker would create for it) and binds
+        the compiled writer to them. Compiled writers are cached per shape.
+        
+        Returns:
+            Callable(record, row_idx) -> bool, or None if not specializable
+        """
+        if not isinstance(record, dict):
+            return None
+        shape = _record_shape(record)
+        if shape is None:
+            return None
+        make, column_keys = _compile_row_writer(shape, sep)
+        if make is None:
             return None
         
-        # Handle numpy arrays
-        if isinstance(value, np.ndarray):
+        bound = []
+        for key in column_keys:
+            column = columns.get(key)
+            if column is None:
+                column = columns[key] = [None] * n_rows
+            bound.append(column)
+        return make(SCALAR_TYPES, self._process_value, *bound)
+    
+    def _process_value(self, value: Any) -> Any:
+        """Process a non-dict value, converting arrays to strings."""
+        if not isinstance(value, list):
+            # Numpy arrays never come out of a JSON parse; test for them last
+            if not isinstance(value, np.ndarray):
+                return value
             value = value.tolist()
         
         if isinstance(value, list):
@@ -82,18 +365,14 @@ class FlatConverter:
             
             # Array of primitives -> pipe-separated
             if isinstance(first_item, (str, int, float, bool)):
-                return "|".join(str(v) for v in value)
+                return join_primitives(value)
             
             # Array of objects -> JSON string
             elif isinstance(first_item, dict):
-                return json.dumps(value, ensure_ascii=False)
+                return dumps_cell(value)
             
             # Nested arrays -> JSON string
             else:
-                return json.dumps(value, ensure_ascii=False)
-        
-        elif isinstance(value, dict):
-            # Process nested dict values
-            return {k: self._process_value(v) for k, v in value.items()}
+                return dumps_cell(value)
         
         return value
@@ -3,15 +3,209 @@ Relational Conversion Mode
 Creates separate linked CSV files for each array of objects.
 """
 
-import json
+import functools
+import itertools
+import sys
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Any, Optional, Tuple
-from collections import defaultdict
+from typing import Callable, Dict, Iterable, List, Any, Optional, Sized, Tuple
 import logging
 
+from src.json_utils import SCALAR_TYPES, dumps_cell
+from src.modes._fast import join_primitives
+
 logger = logging.getLogger(__name__)
 
+# Priority order for ID field detection
+ID_PATTERNS = (
+    'id', '_id', 'ID', 'Id',
+    'employee_id', 'employeeId', 'employeeid',
+    'user_id', 'userId', 'userid',
+    'project_id', 'projectId', 'projectid',
+    'task_id', 'taskId', 'taskid',
+    'order_id', 'orderId', 'orderid',
+    'item_id', 'itemId', 'itemid',
+)
+_ID_PRIORITY = {pattern: rank for rank, pattern in enumerate(ID_PATTERNS)}
+
+# ID suffixes stripped to get a table name, longest first so "_ID" beats "ID"
+ID_SUFFIXES = ('_ID', '_id', 'Id', 'ID')
+
+# Column suffixes marking a foreign key (<parent table>_id)
+FK_SUFFIXES = ('_id', '_Id', '_ID')
+
+# Distinct key layouts remembered by _find_id_field and _builder_for
+ID_CACHE_SIZE = 1024
+
+# Child-record nesting handled by compiled builders; deeper levels use the
+# stack walker, which has no recursion limit
+SPECIALIZE_MAX_DEPTH = 64
+
+
+# Rows added at a time when a table without a size hint fills up
+TABLE_CHUNK_ROWS = 1024
+
+# End-of-iterator marker for the work stack
+_EXHAUSTED = object()
+
+
+def _has_nested_arrays(d: Dict) -> bool:
+    """True if a dict holds an array of objects directly under it."""
+    return any(
+        isinstance(v, list) and v and isinstance(v[0], dict)
+        for v in d.values()
+    )
+
+
+def _field_kind(value: Any) -> Optional[str]:
+    """
+    Classify a top-level field the way _process_fields dispatches on it.
+    
+    Returns:
+        'S' scalar, 'D' flattenable dict, 'N' dict holding arrays of
+        objects, 'C' array of objects (child table), 'P' array of
+        primitives, or None for anything a builder does not handle
+    """
+    if type(value) in SCALAR_TYPES:
+        return 'S'
+    if type(value) is dict:
+        return 'N' if _has_nested_arrays(value) else 'D'
+    if type(value) is list:
+        return 'C' if value and isinstance(value[0], dict) else 'P'
+    return None
+
+
+# Runtime guard per kind; a record failing any guard takes the generic path
+_KIND_GUARDS = {
+    'S': "type({x}) not in S",
+    'D': "type({x}) is not dict or has_nested({x})",
+    'N': "type({x}) is not dict or not has_nested({x})",
+    'C': "type({x}) is not list or not {x} or type({x}[0]) is not dict",
+    'P': "type({x}) is not list or ({x} and isinstance({x}[0], dict))",
+}
+
+
+@functools.lru_cache(maxsize=32)
+def _compile_record_builder(layout: Tuple[str, ...], kinds: Tuple[str, ...], id_index: int) -> Callable:
+    """
+    Generate a row builder for records with one exact key layout.
+    
+    The builder reads each field by literal key, checks that every field
+    still has the kind seen when it was compiled, and only then builds
+    the row: scalars are stored directly, and the other kinds call the
+    same helpers as the generic walker, in field order. Returning False
+    before any side effect leaves the record to the generic path.
+    
+    Returns:
+        Factory taking (S, flatten, has_nested, join, process_record,
+        descend, converter) and returning
+        build(record, table_name, parent_id_field, parent_id_value, depth)
+    """
+    id_field = layout[id_index]
+    body = [f"x{i} = r[{key!r}]" for i, key in enumerate(layout)]
+    body += [f"if {_KIND_GUARDS[kind].format(x=f'x{i}')}: return False"
+             for i, kind in enumerate(kinds)]
+    body.append("row = {parent_id_field: parent_id_value} "
+                "if parent_id_field and parent_id_value is not None else {}")
+    if 'C' in kinds:
+        body.append(f"child_id_field = f\"{{table_name}}_{id_field}\"")
+    
+    for i, (key, kind) in enumerate(zip(layout, kinds)):
+        x = f"x{i}"
+        if kind == 'S':
+            body.append(f"row[{key!r}] = {x}")
+        elif kind == 'D':
+            body.append(f"row.update(flatten({x}, {key + '.'!r}))")
+        elif kind == 'N':
+            body.append(f"descend({x}, row, table_name, {id_field!r}, x{id_index}, {key + '.'!r})")
+        elif kind == 'C':
+            body.append(f"for item in {x}: "
+                        f"process_record(item, {key!r}, child_id_field, x{id_index}, depth + 1)")
+        else:
+            body.append(f"row[{key!r}] = join({x})")
+    body.append("converter.tables[table_name].append(row)")
+    body.append("return True")
+    
+    source = "\n".join(
+        ["def make(S, flatten, has_nested, join, process_record, descend, converter):",
+         "    def build(r, table_name, parent_id_field, parent_id_value, depth):"]
+        + [f"        {line}" for line in body]
+        + ["    return build"]
+    )
+    namespace: Dict[str, Any] = {}
+    exec(compile(source, "<relational-record-builder>", "exec"), namespace)
+    return namespace["make"]
+
+
+class _ColumnTable:
+    """
+    Column-wise row store for one output table.
+    
+    Rows are written field by field into per-column lists, so building
+    the DataFrame is a column wrap rather than a scan over row dicts.
+    Columns are pre-sized to the table's capacity and filled with NaN,
+    as pd.DataFrame(rows) fills fields a row lacks; when full, every
+    column grows by a chunk at once instead of one append per field.
+    """
+    
+    __slots__ = ("columns", "n_rows", "capacity", "first_row_keys")
+    
+    def __init__(self, capacity: int = 0):
+        self.columns: Dict[str, list] = {}
+        self.n_rows = 0
+        self.capacity = capacity
+        self.first_row_keys: Tuple[str, ...] = ()
+    
+    def __len__(self) -> int:
+        return self.n_rows
+    
+    def append(self, row: Dict) -> None:
+        """Add one row; a new column starts out NaN for every slot."""
+        columns = self.columns
+        n_rows = self.n_rows
+        if not n_rows:
+            self.first_row_keys = tuple(row)
+        
+        if n_rows == self.capacity:
+            # Grow like a vector: at least a chunk, else double
+            grow = max(TABLE_CHUNK_ROWS, n_rows)
+            for column in columns.values():
+                column.extend(itertools.repeat(np.nan, grow))
+            self.capacity += grow
+        
+        for key, value in row.items():
+            column = columns.get(key)
+            if column is None:
+                column = columns[key] = [np.nan] * self.capacity
+            column[n_rows] = value
+        self.n_rows = n_rows + 1
+    
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Build the table's DataFrame (same columns and dtypes as from row dicts).
+        
+        pandas still infers each column's dtype from its values; the
+        arrays it builds from the lists are new, so it need not copy them
+        again when consolidating blocks.
+        """
+        if self.capacity > self.n_rows:
+            for column in self.columns.values():
+                del column[self.n_rows:]
+            self.capacity = self.n_rows
+        return pd.DataFrame(self.columns, index=pd.RangeIndex(self.n_rows), copy=False)
+
+
+class _TableSet(dict):
+    """Tables by name, created on first use with a row-count hint if known."""
+    
+    def __init__(self, size_hints: Optional[Dict[str, int]] = None):
+        super().__init__()
+        self.size_hints = size_hints or {}
+    
+    def __missing__(self, name: str) -> _ColumnTable:
+        table = self[name] = _ColumnTable(self.size_hints.get(name, 0))
+        return table
+
 
 class RelationalConverter:
     """
@@ -27,43 +221,66 @@ class RelationalConverter:
     
     def __init__(self):
         self.mode_name = "relational"
-        self.tables: Dict[str, List[Dict]] = defaultdict(list)
+        self.tables: Dict[str, _ColumnTable] = _TableSet()
+        # ID field per record key layout (the result depends only on the keys)
+        self._id_cache: Dict[Tuple, str] = {}
+        # Synthetic IDs for records without an ID field
+        self._auto_ids = itertools.count()
+        # Compiled row builder per record key layout (None: not specializable)
+        self._builders: Dict[Tuple, Optional[Callable]] = {}
+        # Interned "prefix + key" column names: prefix -> {key: full key}
+        self._key_pool: Dict[str, Dict[str, str]] = {}
     
-    def convert(self, data: List[Dict]) -> Dict[str, pd.DataFrame]:
+    def convert(self, data: Iterable[Dict]) -> Dict[str, pd.DataFrame]:
         """
         Convert JSON data to multiple related DataFrames.
         
+        Records are consumed one at a time, so ``data`` may be a stream
+        (e.g. DataExtractor.iter_records()) instead of a materialized list;
+        only the accumulated tables are held in memory.
+        
         Args:
-            data: List of JSON records
+            data: List or iterable of JSON records
             
         Returns:
             Dict mapping table names to DataFrames
         """
-        logger.info(f"Converting {len(data)} records using RELATIONAL mode")
+        if isinstance(data, Sized):
+            logger.info(f"Converting {len(data)} records using RELATIONAL mode")
+            size_hint = len(data)
+        else:
+            logger.info("Converting streamed records using RELATIONAL mode")
+            size_hint = 0
         
-        self.tables = defaultdict(list)
+        self._auto_ids = itertools.count()
         
-        # Detect main ID field
-        sample = data[0] if data else {}
+        # Detect main ID field from the first record
+        records = iter(data)
+        first = next(records, _EXHAUSTED)
+        sample = {} if first is _EXHAUSTED else first
         main_id_field = self._find_id_field(sample)
         main_table_name = self._infer_table_name(sample, main_id_field)
         
+        # One main row per record: size that table up front
+        self.tables = _TableSet({main_table_name: size_hint})
+        
         # Process each record
-        for record in data:
-            self._process_record(
-                record=record,
-                table_name=main_table_name,
-                parent_id_field=None,
-                parent_id_value=None
-            )
+        if first is not _EXHAUSTED:
+            for record in itertools.chain((first,), records):
+                self._process_record(
+                    record=record,
+                    table_name=main_table_name,
+                    parent_id_field=None,
+                    parent_id_value=None
+                )
         
         # Convert to DataFrames
         result = {}
-        for table_name, rows in self.tables.items():
-            if rows:
-                df = pd.DataFrame(rows)
+        for table_name, table in self.tables.items():
+            if table:
+                df = table.to_frame()
                 result[table_name] = df
-                logger.info(f"Created table '{table_name}': {len(rows)} rows, {len(df.columns)} columns")
+                logger.info(f"Created table '{table_name}': {len(table)} rows, {len(df.columns)} columns")
         
         return result
     
@@ -72,17 +289,80 @@ class RelationalConverter:
         record: Dict,
         table_name: str,
         parent_id_field: Optional[str],
-        parent_id_value: Any
+        parent_id_value: Any,
+        depth: int = 0
     ) -> None:
         """
         Process a record and extract related tables.
         
+        Records whose key layout has a compiled builder (see
+        _compile_record_builder) take that fast path. Others are walked
+        with an explicit work stack rather than recursion, so depth is not
+        bounded by the interpreter's recursion limit. Either way rows come
+        out in the same order as a recursive walk: a row is appended once
+        all of its fields (child rows included) are done.
+        
         Args:
             record: JSON record to process
             table_name: Name for this table
             parent_id_field: Parent's ID field name (for foreign key)
             parent_id_value: Parent's ID value
+            depth: Child-record nesting level of this record
         """
+        if depth < SPECIALIZE_MAX_DEPTH:
+            build = self._builder_for(record)
+            if build is not None and build(record, table_name, parent_id_field, parent_id_value, depth):
+                return
+        
+        stack: List[tuple] = []
+        self._push_record(stack, record, table_name, parent_id_field, parent_id_value)
+        self._process_fields(stack)
+    
+    def _builder_for(self, record: Dict) -> Optional[Callable]:
+        """Get (building on first sight) the compiled builder for a record's key layout."""
+        if type(record) is not dict:
+            return None
+        layout = tuple(record)
+        try:
+            return self._builders[layout]
+        except KeyError:
+            pass
+        
+        build = None
+        kinds = tuple(_field_kind(value) for value in record.values())
+        if layout and None not in kinds and all(type(key) is str for key in layout):
+            id_index = layout.index(self._find_id_field(record))
+            # An ID inside a wrapper object needs the generic lookup
+            if kinds[id_index] not in ('D', 'N'):
+                make = _compile_record_builder(layout, kinds, id_index)
+                build = make(SCALAR_TYPES, self._flatten_dict, _has_nested_arrays,
+                             join_primitives, self._process_record, self._descend, self)
+        
+        if len(self._builders) < ID_CACHE_SIZE:
+            self._builders[layout] = build
+        return build
+    
+    def _descend(
+        self,
+        value: Dict,
+        row: Dict,
+        table_name: str,
+        id_field: str,
+        id_value: Any,
+        prefix: str
+    ) -> None:
+        """Process a dict holding arrays of objects into an existing row."""
+        self._process_fields([(iter(value.items()), row, table_name, id_field, id_value, prefix, False)])
+    
+    def _push_record(
+        self,
+        stack: List[tuple],
+        record: Dict,
+        table_name: str,
+        parent_id_field: Optional[str],
+        parent_id_value: Any
+    ) -> None:
+        """Start a row for a record and push its fields onto the work stack."""
         # Find ID field for this record (look inside wrapper objects too)
         id_field, id_value = self._find_id_recursive(record)
         
@@ -93,136 +373,181 @@ class RelationalConverter:
         if parent_id_field and parent_id_value is not None:
             row[parent_id_field] = parent_id_value
         
-        # Process each field - collect arrays for child tables
-        self._process_fields(record, row, table_name, id_field, id_value, prefix="")
-        
-        self.tables[table_name].append(row)
+        stack.append((iter(record.items()), row, table_name, id_field, id_value, "", True))
     
-    def _process_fields(
-        self,
-        obj: Dict,
-        row: Dict,
-        table_name: str,
-        parent_id_field: str,
-        parent_id_value: Any,
-        prefix: str = ""
-    ) -> None:
+    def _process_fields(self, stack: List[tuple]) -> None:
         """
-        Recursively process fields, extracting child tables from nested arrays.
+        Drain the work stack, extracting child tables from nested arrays.
+        
+        Each entry is (field iterator, row, table name, record ID field,
+        record ID value, key prefix, owns row). An entry is suspended while
+        the work it pushed runs, then resumes where its iterator stopped;
+        a record's row is appended when its own entry is exhausted. Child
+        arrays are entries with no row, whose iterator yields the child
+        records (table name / ID then being the child table and foreign key).
         """
-        for key, value in obj.items():
-            full_key = f"{prefix}{key}" if prefix else key
+        tables = self.tables
+        key_pool = self._key_pool
+        
+        while stack:
+            items, row, table_name, id_field, id_value, prefix, owns_row = stack[-1]
             
-            if isinstance(value, np.ndarray):
-                value = value.tolist()
+            if row is None:
+                # Start the next child record, in array order
+                item = next(items, _EXHAUSTED)
+                if item is _EXHAUSTED:
+                    stack.pop()
+                else:
+                    self._push_record(stack, item, table_name, id_field, id_value)
+                continue
             
-            if isinstance(value, dict):
-                # Check if this dict contains arrays of objects
-                has_nested_arrays = any(
-                    isinstance(v, list) and v and isinstance(v[0], dict)
-                    for v in value.values()
-                )
-                
-                if has_nested_arrays:
-                    # Recurse into dict to find and extract arrays
-                    self._process_fields(
-                        value, row, table_name, parent_id_field, parent_id_value,
-                        prefix=full_key + "."
-                    )
+            # Top-level keys are used as they are
+            full_keys = None
+            if prefix:
+                full_keys = key_pool.get(prefix)
+                if full_keys is None:
+                    full_keys = key_pool[prefix] = {}
+            
+            for key, value in items:
+                if full_keys is None:
+                    full_key = key
                 else:
-                    # Simple nested dict - flatten with dot notation
-                    flat = self._flatten_dict(value, f"{full_key}.")
-                    row.update(flat)
+                    full_key = full_keys.get(key)
+                    if full_key is None:
+                        full_key = full_keys[key] = sys.intern(f"{prefix}{key}")
                 
-            elif isinstance(value, list) and value and isinstance(value[0], dict):
-                # Array of objects - create child table
-                child_table_name = key
-                child_id_field = f"{table_name}_{parent_id_field}"
-                
-                for item in value:
-                    self._process_record(
-                        record=item,
-                        table_name=child_table_name,
-                        parent_id_field=child_id_field,
-                        parent_id_value=parent_id_value
-                    )
+                # Scalars (the common case) skip the isinstance chain
+                if type(value) in SCALAR_TYPES:
+                    row[full_key] = value
+                    
+                elif isinstance(value, dict):
+                    # Check if this dict contains arrays of objects
+                    if _has_nested_arrays(value):
+                        # Descend into dict to find and extract arrays
+                        stack.append((
+                            iter(value.items()), row, table_name, id_field, id_value,
+                            full_key + ".", False
+                        ))
+                        break
+                    
+                    # Simple nested dict - flatten with dot notation
+                    row.update(self._flatten_dict(value, f"{full_key}."))
+                    
+                elif isinstance(value, list) and value and isinstance(value[0], dict):
+                    # Array of objects - create child table, one item at a time
+                    child_id_field = f"{table_name}_{id_field}"
+                    stack.append((iter(value), None, key, child_id_field, id_value, "", False))
+                    break
                     
-            elif isinstance(value, list):
-                # Array of primitives - pipe separated
-                row[full_key] = "|".join(str(v) for v in value) if value else ""
+                elif isinstance(value, list):
+                    # Array of primitives - pipe separated
+                    row[full_key] = join_primitives(value)
                 
+                elif isinstance(value, np.ndarray):
+                    # Numpy arrays never come out of a JSON parse; re-dispatch as a list
+                    stack.append((
+                        iter(((key, value.tolist()),)), row, table_name, id_field, id_value,
+                        prefix, False
+                    ))
+                    break
+                    
+                else:
+                    row[full_key] = value
             else:
-                row[full_key] = value
+                stack.pop()
+                if owns_row:
+                    tables[table_name].append(row)
     
     def _find_id_recursive(self, record: Dict) -> Tuple[str, Any]:
         """Find ID field, even if nested in wrapper object like 'employee'."""
         # Check top level
         id_field = self._find_id_field(record)
         if id_field in record and not isinstance(record[id_field], dict):
-            return id_field, record.get(id_field, str(hash(str(record)))[:8])
+            return id_field, record[id_field]
         
         # Check inside wrapper objects
         for key, value in record.items():
             if isinstance(value, dict):
                 nested_id = self._find_id_field(value)
                 if nested_id in value and not isinstance(value[nested_id], dict):
-                    return nested_id, value.get(nested_id, str(hash(str(record)))[:8])
+                    return nested_id, value[nested_id]
         
-        # Fallback
-        return "id", str(hash(str(record)))[:8]
+        # Fallback: a synthetic ID, unique within this conversion
+        return "id", f"__auto_{next(self._auto_ids)}"
     
     def _flatten_dict(self, d: Dict, prefix: str = "") -> Dict:
-        """Flatten nested dictionary with dot notation."""
+        """Flatten nested dictionary with dot notation (depth-first, no recursion)."""
         flat = {}
+        key_pool = self._key_pool
+        stack = [(iter(d.items()), prefix)]
         
-        for key, value in d.items():
-            full_key = f"{prefix}{key}"
-            
-            if isinstance(value, np.ndarray):
-                value = value.tolist()
+        while stack:
+            items, prefix = stack[-1]
+            full_keys = key_pool.get(prefix)
+            if full_keys is None:
+                full_keys = key_pool[prefix] = {}
             
-            if isinstance(value, dict):
-                flat.update(self._flatten_dict(value, full_key + "."))
+            for key, value in items:
+                full_key = full_keys.get(key)
+                if full_key is None:
+                    full_key = full_keys[key] = sys.intern(f"{prefix}{key}")
                 
-            elif isinstance(value, list):
-                if value and isinstance(value[0], dict):
-                    # Deep nested array - keep as JSON
-                    flat[full_key] = json.dumps(value, ensure_ascii=False)
-                elif value:
-                    flat[full_key] = "|".join(str(v) for v in value)
+                if type(value) in SCALAR_TYPES:
+                    flat[full_key] = value
+                
+                elif isinstance(value, dict):
+                    stack.append((iter(value.items()), full_key + "."))
+                    break
+                    
+                elif isinstance(value, list):
+                    if value and isinstance(value[0], dict):
+                        # Deep nested array - keep as JSON
+                        flat[full_key] = dumps_cell(value)
+                    elif value:
+                        flat[full_key] = join_primitives(value)
+                    else:
+                        flat[full_key] = ""
+                elif isinstance(value, np.ndarray):
+                    # Numpy arrays never come out of a JSON parse; re-dispatch as a list
+                    stack.append((iter(((key, value.tolist()),)), prefix))
+                    break
                 else:
-                    flat[full_key] = ""
+                    flat[full_key] = value
             else:
-                flat[full_key] = value
+                stack.pop()
         
         return flat
     
     def _find_id_field(self, record: Dict) -> str:
-        """Find the most likely ID field in a record."""
-        # Priority order for ID field detection
-        id_patterns = [
-            'id', '_id', 'ID', 'Id',
-            'employee_id', 'employeeId', 'employeeid',
-            'user_id', 'userId', 'userid',
-            'project_id', 'projectId', 'projectid',
-            'task_id', 'taskId', 'taskid',
-            'order_id', 'orderId', 'orderid',
-            'item_id', 'itemId', 'itemid',
-        ]
-        
-        # Check exact matches first
-        for pattern in id_patterns:
-            if pattern in record:
-                return pattern
+        """
+        Find the most likely ID field in a record.
+        
+        Homogeneous data repeats the same keys, so the answer is cached
+        per key layout (in order: the fallbacks depend on key order).
+        """
+        layout = tuple(record)
+        id_field = self._id_cache.get(layout)
+        if id_field is None:
+            id_field = self._detect_id_field(layout)
+            if len(self._id_cache) < ID_CACHE_SIZE:
+                self._id_cache[layout] = id_field
+        return id_field
+    
+    def _detect_id_field(self, keys: Tuple) -> str:
+        """Pick the ID field from a record's keys."""
+        # Check exact matches first, best-ranked pattern wins
+        matches = _ID_PRIORITY.keys() & keys
+        if matches:
+            return min(matches, key=_ID_PRIORITY.__getitem__)
         
         # Check fields ending with 'id' or 'Id'
-        for key in record.keys():
+        for key in keys:
             lower = key.lower()
             if lower.endswith('id') and len(key) <= 20:
                 return key
         
         # Fallback to first field
-        return list(record.keys())[0] if record else "id"
+        return keys[0] if keys else "id"
     
     def _infer_table_name(self, record: Dict, id_field: str) -> str:
         """Infer main table name from ID field."""
@@ -234,7 +559,7 @@ class RelationalConverter:
         
         # Remove common suffixes
         name = id_field
-        for suffix in ['_id', 'Id', 'ID', '_ID']:
+        for suffix in ID_SUFFIXES:
             if name.endswith(suffix):
                 name = name[:-len(suffix)]
                 break
@@ -254,14 +579,12 @@ class RelationalConverter:
         """
         relationships = []
         
-        for table_name, rows in self.tables.items():
-            if rows:
-                sample = rows[0]
-                for field in sample.keys():
-                    if '_' in field and field.endswith(tuple(['_id', '_Id', '_ID'])):
+        for table_name, table in self.tables.items():
+            if table:
+                for field in table.first_row_keys:
+                    if field.endswith(FK_SUFFIXES):
                         # This looks like a foreign key
-                        parts = field.rsplit('_', 1)
-                        parent_table = parts[0]
+                        parent_table = field.rsplit('_', 1)[0]
                         if parent_table in self.tables:
                             relationships.append((table_name, parent_table, field))
         
@@ -4,25 +4,33 @@ Converts ANY JSON file to CSV with interactive mode selection.
 Supports multiple conversion modes: flat, explode, relational.
 """
 
+import copy
+import functools
+import os
 import sys
 import time
 import json
+from collections import Counter
 from pathlib import Path
-from typing import Optional, Dict, List
+from typing import TYPE_CHECKING, Iterable, Optional, Dict, List, Tuple
 import logging
 
-# Add project root to path
-project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root))
+# Run as a script (python src/pipeline.py): make the src package importable.
+# Imported as src.pipeline or run with -m, the root is already on sys.path.
+if not __package__:
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.extractor import DataExtractor
 from src.transformer import DataTransformer
 from src.loader import DataLoader
-from src.logger_config import get_logger_from_config, load_config
+from src.logger_config import get_logger_from_config, is_logger_running, load_config
 from src.analyzer import JSONAnalyzer
 from src.preview import PreviewGenerator
 from src.modes import FlatConverter, ExplodeConverter, RelationalConverter
 
+if TYPE_CHECKING:
+    import pandas as pd
+
 # Try to import tqdm for progress bar
 try:
     from tqdm import tqdm
@@ -30,6 +38,83 @@ try:
 except ImportError:
     TQDM_AVAILABLE = False
 
+# Answers accepted at the interactive mode prompt ('q' cancels)
+MODE_CHOICES = frozenset(('1', '2', '3', 'q'))
+
+# Parsed config files kept for reuse by later pipelines
+CONFIG_CACHE_SIZE = 4
+
+# Logger set up from each config file, with the file's mtime at setup
+_config_loggers: Dict[str, Tuple[Optional[int], logging.Logger]] = {}
+
+
+@functools.lru_cache(maxsize=CONFIG_CACHE_SIZE)
+def _parse_config(config_path: str, mtime_ns: int) -> dict:
+    """Parse a config file once per modification time."""
+    return load_config(config_path)
+
+
+def _cached_load_config(config_path: str) -> dict:
+    """
+    load_config, memoized per file until the file changes.
+    
+    Returns:
+        A copy of the parsed config, safe for the caller to modify
+    """
+    mtime_ns = Path(config_path).stat().st_mtime_ns
+    return copy.deepcopy(_parse_config(config_path, mtime_ns))
+
+
+def _cached_logger_from_config(config_path: str) -> logging.Logger:
+    """
+    get_logger_from_config, reusing the logger of an earlier pipeline.
+    
+    Setting the logger up again would restart its file listener thread and
+    queue another exit finalizer on every pipeline instance. It is redone
+    only if the config file changed or the logger has been shut down.
+    """
+    try:
+        mtime_ns = Path(config_path).stat().st_mtime_ns
+    except OSError:
+        mtime_ns = None
+    cached = _config_loggers.get(config_path)
+    if cached is not None and cached[0] == mtime_ns and is_logger_running(cached[1].name):
+        return cached[1]
+    logger = get_logger_from_config(config_path)
+    _config_loggers[config_path] = (mtime_ns, logger)
+    return logger
+
+
+def unique_output_names(input_files: Iterable[str]) -> List[str]:
+    """
+    One CSV filename per input file, distinct across the batch.
+    
+    Each output is named after its input's stem, so parallel conversions
+    never share a timestamped filename. Inputs with the same stem in
+    different directories (a/x.json, b/x.json) get a numbered name
+    (x_1.csv, x_2.csv) instead of overwriting each other.
+    
+    Args:
+        input_files: Input paths, in batch order
+    
+    Returns:
+        Output filenames, in the same order
+    """
+    stems = [Path(p).stem for p in input_files]
+    counts = Counter(stems)
+    taken = {f"{stem}.csv" for stem, count in counts.items() if count == 1}
+    names = []
+    for stem in stems:
+        if counts[stem] == 1:
+            names.append(f"{stem}.csv")
+            continue
+        n = 1
+        while f"{stem}_{n}.csv" in taken:
+            n += 1
+        taken.add(f"{stem}_{n}.csv")
+        names.append(f"{stem}_{n}.csv")
+    return names
+
 
 def format_duration(seconds: float) -> str:
     """Format duration in human-readable format."""
@@ -70,7 +155,9 @@ class JSONToCSVPipeline:
         self,
         input_file: str,
         output_dir: Optional[str] = None,
-        config_path: str = "config/config.yaml"
+        config_path: str = "config/config.yaml",
+        verbose: bool = True,
+        cache_parsed: bool = False
     ):
         """
         Initialize the pipeline.
@@ -79,25 +166,33 @@ class JSONToCSVPipeline:
             input_file: Path to input JSON file (any structure)
             output_dir: Directory for output CSV (optional)
             config_path: Path to configuration file (optional)
+            verbose: Print per-table and per-step details (step headers,
+                durations and the summary are always printed)
+            cache_parsed: Keep the parsed input in the extractor's
+                process-wide cache, so run_interactive's analysis parse is
+                reused by the conversion (and by later pipelines over the
+                same unchanged file)
         """
         # Load configuration
         try:
-            self.config = load_config(config_path)
+            self.config = _cached_load_config(config_path)
         except Exception:
             self.config = self._get_default_config()
 
         # Setup logger
         try:
-            self.logger = get_logger_from_config(config_path)
+            self.logger = _cached_logger_from_config(config_path)
         except Exception:
             logging.basicConfig(level=logging.INFO)
             self.logger = logging.getLogger(__name__)
 
         # Initialize components
         self.input_file = input_file
+        self.verbose = verbose
+        self.cache_parsed = cache_parsed
         self.output_dir = output_dir or self.config.get('paths', {}).get('output_dir', 'data/output')
 
-        self.extractor = DataExtractor(input_file)
+        self.extractor = DataExtractor(input_file, cache_parsed=cache_parsed)
         self.transformer = DataTransformer()
         self.loader = DataLoader(self.output_dir)
         
@@ -141,7 +236,7 @@ class JSONToCSVPipeline:
         print("  Analyzing JSON structure...")
         print("=" * 65)
         
-        analyzer = JSONAnalyzer(self.input_file)
+        analyzer = JSONAnalyzer(self.input_file, cache_parsed=self.cache_parsed)
         analysis = analyzer.analyze()
         
         # Step 2: Generate and display preview
@@ -151,23 +246,42 @@ class JSONToCSVPipeline:
         # Step 3: Get user mode selection
         if not analysis.has_array_of_objects:
             # No nested arrays - use flat mode
-            input("\n  Press ENTER to continue with FLAT mode...")
+            try:
+                input("\n  Press ENTER to continue with FLAT mode...")
+            except EOFError:
+                # Closed stdin (scripted run): nothing to confirm
+                print()
             mode = 1
         else:
             # Let user choose
-            while True:
-                choice = input().strip().lower()
-                if choice == 'q':
-                    print("\n  Cancelled by user.")
-                    return []
-                if choice in ['1', '2', '3']:
-                    mode = int(choice)
-                    break
-                print("  Invalid choice. Enter 1, 2, 3, or 'q': ", end="")
+            choice = self._read_mode_choice()
+            if choice is None or choice == 'q':
+                print("\n  Cancelled by user.")
+                return []
+            mode = int(choice)
         
         # Step 4: Run conversion with selected mode
         return self.run_with_mode(mode, output_filename)
     
+    def _read_mode_choice(self) -> Optional[str]:
+        """
+        Read the mode answer, re-prompting once after an invalid one.
+        
+        Returns:
+            A value from MODE_CHOICES, or None if stdin is closed or the
+            second answer is invalid too (callers treat both as cancel)
+        """
+        for attempt in range(2):
+            try:
+                choice = input().strip().lower()
+            except EOFError:
+                return None
+            if choice in MODE_CHOICES:
+                return choice
+            if not attempt:
+                print("  Invalid choice. Enter 1, 2, 3, or 'q': ", end="")
+        return None
+    
     def run_with_mode(self, mode: int, output_filename: Optional[str] = None) -> List[Path]:
         """
         Run pipeline with specified conversion mode.
@@ -187,18 +301,23 @@ class JSONToCSVPipeline:
         print("=" * 65)
         
         try:
-            self.logger.info(f"Pipeline started with mode {mode}")
+            self.logger.info("Pipeline started with mode %s", mode)
             
             # ===== STEP 1: EXTRACT RAW DATA =====
             self._print_step(1, 4, "Extracting raw JSON data...")
             step_start = time.time()
             
-            data = self.extractor.extract_from_json()
+            # Every mode consumes records one at a time, so large inputs
+            # are streamed into the converter instead of loaded whole
+            data = self.extractor.iter_records()
             
             step_duration = time.time() - step_start
             self.timings['extract'] = step_duration
             
-            print(f"    Records: {len(data):,}")
+            if isinstance(data, list):
+                print(f"    Records: {len(data):,}")
+            else:
+                print("    Records: streamed during conversion")
             print(f"    Duration: {format_duration(step_duration)}")
             
             # ===== STEP 2: CONVERT =====
@@ -211,19 +330,19 @@ class JSONToCSVPipeline:
             step_duration = time.time() - step_start
             self.timings['convert'] = step_duration
             
+            # (rows, columns) per table, reused by the summary output
+            sizes = {name: df.shape for name, df in tables.items()}
             print(f"    Tables: {len(tables)}")
-            for name, df in tables.items():
-                print(f"      - {name}: {len(df):,} rows, {len(df.columns)} columns")
+            if self.verbose:
+                for name, (n_rows, n_columns) in sizes.items():
+                    print(f"      - {name}: {n_rows:,} rows, {n_columns} columns")
             print(f"    Duration: {format_duration(step_duration)}")
             
             # ===== STEP 3: TRANSFORM (dedupe) =====
             self._print_step(3, 4, "Transforming data...")
             step_start = time.time()
             
-            transformed_tables = {}
-            for name, df in tables.items():
-                transformed = self.transformer.transform_dataframe(df, drop_duplicates=True)
-                transformed_tables[name] = transformed
+            transformed_tables = self._transform_tables(tables)
             
             step_duration = time.time() - step_start
             self.timings['transform'] = step_duration
@@ -233,26 +352,7 @@ class JSONToCSVPipeline:
             self._print_step(4, 4, "Writing CSV files...")
             step_start = time.time()
             
-            output_config = self.config.get('output', {})
-            output_paths = []
-            
-            for name, df in transformed_tables.items():
-                # Generate filename
-                if len(transformed_tables) == 1:
-                    fname = output_filename
-                else:
-                    base = output_filename.replace('.csv', '') if output_filename else name
-                    fname = f"{base}_{name}.csv" if output_filename else f"{name}.csv"
-                
-                output_path = self.loader.load_to_csv(
-                    df,
-                    filename=fname,
-                    add_timestamp=output_config.get('timestamp_suffix', True) if not output_filename else False,
-                    encoding=output_config.get('csv_encoding', 'utf-8'),
-                    index=output_config.get('csv_index', False)
-                )
-                output_paths.append(output_path)
-                print(f"    Created: {output_path.name} ({len(df):,} rows)")
+            output_paths = self._write_tables(transformed_tables, output_filename)
             
             step_duration = time.time() - step_start
             self.timings['load'] = step_duration
@@ -260,36 +360,84 @@ class JSONToCSVPipeline:
             
             # ===== SUMMARY =====
             total_duration = time.time() - total_start
-            self._print_multi_summary(tables, transformed_tables, output_paths, total_duration)
+            self._print_multi_summary(sizes, transformed_tables, output_paths, total_duration)
             
-            self.logger.info(f"Pipeline completed in {format_duration(total_duration)}")
+            self.logger.info("Pipeline completed in %s", format_duration(total_duration))
             return output_paths
             
         except Exception as e:
-            self.logger.error(f"Pipeline failed: {str(e)}")
+            self.logger.error("Pipeline failed: %s", e)
             print(f"\n[ERROR] Pipeline failed: {str(e)}")
             raise
     
-    def _print_multi_summary(self, original_tables, final_tables, output_paths, total_duration):
-        """Print summary for multi-table output."""
-        print("\n" + "=" * 65)
-        print("  COMPLETED SUCCESSFULLY")
-        print("=" * 65)
+    def _transform_tables(self, tables: Dict[str, "pd.DataFrame"]) -> Dict[str, "pd.DataFrame"]:
+        """
+        Deduplicate and clean every table, in table order.
         
-        total_input = sum(len(df) for df in original_tables.values())
+        The tables share self.transformer, whose transformed_data is left
+        as the last table's, as after the original per-table loop.
+        
+        Args:
+            tables: Converted tables by name
+        """
+        return {
+            name: self.transformer.transform_dataframe(
+                df, drop_duplicates=True, verbose=self.verbose, copy=False
+            )
+            for name, df in tables.items()
+        }
+
+    def _write_tables(self, tables: Dict[str, "pd.DataFrame"], output_filename: Optional[str]) -> List[Path]:
+        """
+        Write each table to its own CSV file, in table order.
+        
+        Returns:
+            Paths of the created CSV files, in table order
+        """
+        output_config = self.config.get('output', {})
+        write_options = dict(
+            add_timestamp=output_config.get('timestamp_suffix', True) if not output_filename else False,
+            encoding=output_config.get('csv_encoding', 'utf-8'),
+            index=output_config.get('csv_index', False),
+            engine=output_config.get('csv_engine', 'pandas')
+        )
+        jobs = []
+        
+        for name, df in tables.items():
+            # Generate filename
+            if len(tables) == 1:
+                fname = output_filename
+            else:
+                base = output_filename.replace('.csv', '') if output_filename else name
+                fname = f"{base}_{name}.csv" if output_filename else f"{name}.csv"
+            
+            jobs.append((df, dict(write_options, filename=fname)))
+        
+        output_paths = [self.loader.load_to_csv(df, **options) for df, options in jobs]
+        
+        if self.verbose and jobs:
+            print("\n".join(
+                f"    Created: {output_path.name} ({len(df):,} rows)"
+                for (df, _), output_path in zip(jobs, output_paths)
+            ))
+        return output_paths
+
+    def _print_multi_summary(self, input_sizes, final_tables, output_paths, total_duration):
+        """Print summary for multi-table output (built first, written at once)."""
+        total_input = sum(n_rows for n_rows, _ in input_sizes.values())
         total_output = sum(len(df) for df in final_tables.values())
         
-        print(f"""
+        lines = ["", "=" * 65, "  COMPLETED SUCCESSFULLY", "=" * 65, f"""
   Input Records:  {total_input:,}
   Output Records: {total_output:,}
   Tables Created: {len(output_paths)}
   
-  Output Files:""")
+  Output Files:"""]
         for path in output_paths:
             size_kb = path.stat().st_size / 1024
-            print(f"    - {path.name} ({size_kb:.2f} KB)")
+            lines.append(f"    - {path.name} ({size_kb:.2f} KB)")
         
-        print(f"""
+        lines.append(f"""
   Timing:
     - Extract:   {format_duration(self.timings.get('extract', 0))}
     - Convert:   {format_duration(self.timings.get('convert', 0))}
@@ -297,13 +445,18 @@ class JSONToCSVPipeline:
     - Load:      {format_duration(self.timings.get('load', 0))}
     - TOTAL:     {format_duration(total_duration)}
 """)
-        print("=" * 65)
+        lines.append("=" * 65)
+        sys.stdout.write("\n".join(lines) + "\n")
 
     def run(self, output_filename: Optional[str] = None, mode: int = 1) -> Path:
         """
         Run the pipeline - converts JSON to CSV automatically.
         Shows progress and timing for each step.
         
+        With output.chunk_size set in the config, records are streamed
+        through extract, transform and load in chunks of that many rows
+        (see _run_chunked) instead of as one DataFrame.
+        
         Args:
             output_filename: Custom output filename (optional)
         
@@ -319,6 +472,10 @@ class JSONToCSVPipeline:
         print(f"  Output: {self.output_dir}")
         print("=" * 60)
         
+        chunk_size = self.config.get('output', {}).get('chunk_size')
+        if chunk_size:
+            return self._run_chunked(output_filename, chunk_size, total_start)
+        
         try:
             self.logger.info("Pipeline execution started")
             
@@ -336,13 +493,15 @@ class JSONToCSVPipeline:
             
             print(f"    Records: {len(df):,} | Columns: {len(df.columns)}")
             print(f"    Duration: {format_duration(step_duration)}")
-            self.logger.info(f"Extracted: {len(df)} records in {format_duration(step_duration)}")
+            self.logger.info("Extracted: %d records in %s", len(df), format_duration(step_duration))
             
             # ===== STEP 2: TRANSFORM =====
             self._print_step(2, 3, "Transforming data...")
             step_start = time.time()
             
-            transformed_df = self.transformer.transform_dataframe(df, drop_duplicates=True)
+            transformed_df = self.transformer.transform_dataframe(
+                df, drop_duplicates=True, verbose=self.verbose, copy=False
+            )
             
             step_duration = time.time() - step_start
             self.timings['transform'] = step_duration
@@ -353,7 +512,7 @@ class JSONToCSVPipeline:
             removed = len(df) - len(transformed_df)
             print(f"    Records: {len(transformed_df):,} | Removed: {removed:,}")
             print(f"    Duration: {format_duration(step_duration)}")
-            self.logger.info(f"Transformed: {len(transformed_df)} records in {format_duration(step_duration)}")
+            self.logger.info("Transformed: %d records in %s", len(transformed_df), format_duration(step_duration))
             
             # ===== STEP 3: LOAD =====
             self._print_step(3, 3, "Writing to CSV...")
@@ -365,7 +524,8 @@ class JSONToCSVPipeline:
                 filename=output_filename,
                 add_timestamp=output_config.get('timestamp_suffix', True),
                 encoding=output_config.get('csv_encoding', 'utf-8'),
-                index=output_config.get('csv_index', False)
+                index=output_config.get('csv_index', False),
+                engine=output_config.get('csv_engine', 'pandas')
             )
             
             step_duration = time.time() - step_start
@@ -375,33 +535,130 @@ class JSONToCSVPipeline:
             print(f"    File: {output_path.name}")
             print(f"    Size: {file_size:.2f} KB")
             print(f"    Duration: {format_duration(step_duration)}")
-            self.logger.info(f"Loaded: {output_path} in {format_duration(step_duration)}")
+            self.logger.info("Loaded: %s in %s", output_path, format_duration(step_duration))
             
             # ===== SUMMARY =====
             total_duration = time.time() - total_start
             self.timings['total'] = total_duration
             
-            self._print_summary(df, transformed_df, output_path, total_duration)
+            self._print_summary(len(df), len(transformed_df), len(transformed_df.columns),
+                                output_path, total_duration)
             
-            self.logger.info(f"Pipeline completed in {format_duration(total_duration)}")
+            self.logger.info("Pipeline completed in %s", format_duration(total_duration))
             
             return output_path
             
         except Exception as e:
-            self.logger.error(f"Pipeline failed: {str(e)}")
+            self.logger.error("Pipeline failed: %s", e)
             print(f"\n[ERROR] Pipeline failed: {str(e)}")
             raise
 
-    def _print_summary(self, original_df, final_df, output_path, total_duration: float = 0):
-        """Print pipeline execution summary with timing."""
-        print("\n" + "=" * 60)
-        print("  COMPLETED SUCCESSFULLY")
-        print("=" * 60)
-        print(f"""
-  Input Records:    {len(original_df):,}
-  Output Records:   {len(final_df):,}
-  Records Filtered: {len(original_df) - len(final_df):,}
-  Columns:          {len(final_df.columns)}
+    def _run_chunked(self, output_filename: Optional[str], chunk_size: int, total_start: float) -> Path:
+        """
+        Stream the input to one CSV, chunk by chunk.
+        
+        Each chunk of records is flattened, deduplicated against every
+        earlier chunk, cleaned and appended to the output file, so peak
+        memory is bounded by the chunk size rather than the input size.
+        
+        The CSV columns are collected first, in one streaming pass over
+        the input (DataExtractor.discover_columns), so a column that first
+        appears in a later chunk is still written. Unlike the
+        single-DataFrame run, duplicates are found by row hash
+        (approximate, see DataTransformer.drop_seen_duplicates); row order
+        is kept.
+        
+        Args:
+            output_filename: Custom output filename (optional)
+            chunk_size: Records per chunk
+            total_start: Start time of the run, for the total duration
+        
+        Returns:
+            Path to the created CSV file
+        """
+        output_config = self.config.get('output', {})
+        self.timings = {'extract': 0.0, 'transform': 0.0, 'load': 0.0}
+        
+        seen: set = set()
+        output_path: Optional[Path] = None
+        input_rows = output_rows = 0
+        
+        try:
+            self.logger.info("Pipeline execution started (chunks of %d rows)", chunk_size)
+            self._print_step(1, 1, f"Streaming JSON to CSV in chunks of {chunk_size:,} rows...")
+            
+            # Header of the whole input, so no chunk can add a column
+            step_start = time.time()
+            columns = self.extractor.discover_columns()
+            self.timings['extract'] += time.time() - step_start
+            
+            chunks = self.extractor.iter_dataframes(chunk_size)
+            while True:
+                # ===== EXTRACT =====
+                step_start = time.time()
+                chunk = next(chunks, None)
+                self.timings['extract'] += time.time() - step_start
+                if chunk is None:
+                    break
+                input_rows += len(chunk)
+                
+                # ===== TRANSFORM =====
+                step_start = time.time()
+                if chunk.columns.tolist() != columns:
+                    chunk = chunk.reindex(columns=columns)
+                chunk = self.transformer.drop_seen_duplicates(chunk, seen)
+                chunk = self.transformer.transform_dataframe(chunk, drop_duplicates=False, verbose=False, copy=False)
+                self.timings['transform'] += time.time() - step_start
+                if chunk.empty:
+                    continue
+                
+                # ===== LOAD =====
+                step_start = time.time()
+                first = output_path is None
+                output_path = self.loader.load_to_csv(
+                    chunk,
+                    filename=output_filename if first else output_path.name,
+                    add_timestamp=output_config.get('timestamp_suffix', True),
+                    encoding=output_config.get('csv_encoding', 'utf-8'),
+                    index=output_config.get('csv_index', False),
+                    engine=output_config.get('csv_engine', 'pandas'),
+                    mode='w' if first else 'a',
+                    header=first
+                )
+                self.timings['load'] += time.time() - step_start
+                output_rows += len(chunk)
+                del chunk
+            
+            if output_path is None:
+                raise ValueError("No data found in JSON file")
+            
+            removed = input_rows - output_rows
+            print(f"    Records: {input_rows:,} | Removed: {removed:,} | Columns: {len(columns)}")
+            self.logger.info("Streamed %d records, wrote %d to %s", input_rows, output_rows, output_path)
+            
+            # ===== SUMMARY =====
+            total_duration = time.time() - total_start
+            self.timings['total'] = total_duration
+            
+            self._print_summary(input_rows, output_rows, len(columns), output_path, total_duration)
+            
+            self.logger.info("Pipeline completed in %s", format_duration(total_duration))
+            
+            return output_path
+            
+        except Exception as e:
+            self.logger.error("Pipeline failed: %s", e)
+            print(f"\n[ERROR] Pipeline failed: {str(e)}")
+            raise
+
+    def _print_summary(self, input_rows: int, output_rows: int, n_columns: int,
+                       output_path, total_duration: float = 0):
+        """Print pipeline execution summary with timing (built first, written at once)."""
+        summary = f"""
+  Input Records:    {input_rows:,}
+  Output Records:   {output_rows:,}
+  Records Filtered: {input_rows - output_rows:,}
+  Columns:          {n_columns}
   
   Output File: {output_path}
   File Size:   {output_path.stat().st_size / 1024:.2f} KB
@@ -411,8 +668,9 @@ class JSONToCSVPipeline:
     - Transform: {format_duration(self.timings.get('transform', 0))}
     - Load:      {format_duration(self.timings.get('load', 0))}
     - TOTAL:     {format_duration(total_duration)}
-""")
-        print("=" * 60)
+"""
+        rule = "=" * 60
+        sys.stdout.write("\n".join(["", rule, "  COMPLETED SUCCESSFULLY", rule, summary, rule]) + "\n")
 
 
 def main():
@@ -3,12 +3,42 @@ Interactive Preview Module
 Shows JSON structure analysis and conversion mode options with examples.
 """
 
-import json
 from typing import Dict, List, Any, Optional
 from dataclasses import dataclass
-import pandas as pd
 
 from src.analyzer import JSONAnalyzer, StructureAnalysis, FieldInfo
+from src.json_utils import SCALAR_TYPES, dumps_cell_head
+
+
+def _flat_scalars(d: Dict, prefix: str, out: Dict) -> None:
+    """
+    Write the scalar leaves of a nested dict into out under dotted keys.
+    
+    Same keys and order as pd.json_normalize([d], sep='.'), without
+    building a DataFrame: the top level's scalars come first, then each
+    nested dict depth-first. Lists are skipped (the caller handles them).
+    Values keep their JSON types instead of taking the row's common dtype.
+    
+    Args:
+        d: Dict to flatten
+        prefix: Key prefix, ending in "." unless empty
+        out: Row dict to write into
+    """
+    for key, value in d.items():
+        if type(value) in SCALAR_TYPES:
+            out[f"{prefix}{key}"] = value
+    for key, value in d.items():
+        if type(value) is dict:
+            _walk_scalars(value, f"{prefix}{key}.", out)
+
+
+def _walk_scalars(d: Dict, prefix: str, out: Dict) -> None:
+    """Depth-first, key-order part of _flat_scalars below the top level."""
+    for key, value in d.items():
+        if type(value) is dict:
+            _walk_scalars(value, f"{prefix}{key}.", out)
+        elif type(value) is not list:
+            out[f"{prefix}{key}"] = value
 
 
 @dataclass
@@ -36,6 +66,9 @@ class PreviewGenerator:
         self.analyzer = analyzer
         self.analysis = analyzer.analysis
         self.sample_record = analyzer.get_sample_record()
+        # Rendered output, built on first use (the analysis does not change)
+        self._mode_previews: Dict[int, ModePreview] = {}
+        self._full_preview: Optional[str] = None
     
     def generate_header(self) -> str:
         """Generate the analysis header section."""
@@ -70,20 +103,25 @@ class PreviewGenerator:
         return "\n".join(lines)
     
     def generate_mode_preview(self, mode: int) -> ModePreview:
-        """Generate preview for a specific mode."""
+        """Generate preview for a specific mode (cached per mode)."""
+        preview = self._mode_previews.get(mode)
+        if preview is not None:
+            return preview
         if mode == 1:
-            return self._generate_flat_preview()
+            preview = self._generate_flat_preview()
         elif mode == 2:
-            return self._generate_explode_preview()
+            preview = self._generate_explode_preview()
         elif mode == 3:
-            return self._generate_relational_preview()
+            preview = self._generate_relational_preview()
         else:
             raise ValueError(f"Unknown mode: {mode}")
+        self._mode_previews[mode] = preview
+        return preview
     
     def _generate_flat_preview(self) -> ModePreview:
         """Generate preview for FLAT mode."""
         # Create sample flat output
-        sample_df = self._create_flat_sample()
+        sample_rows = self._create_flat_sample()
         
         return ModePreview(
             mode_id=1,
@@ -98,7 +136,7 @@ class PreviewGenerator:
             output_files=1,
             output_file_names=["output.csv"],
             estimated_rows=self.analysis.record_count,
-            sample_table=self._df_to_ascii(sample_df, max_cols=4),
+            sample_table=self._rows_to_ascii(sample_rows, max_cols=4),
             pros=["Single file, easy to manage", "Original data preserved", "1 row = 1 record"],
             cons=["Arrays need JSON parsing to use", "Cannot filter/sort by nested values"]
         )
@@ -106,7 +144,7 @@ class PreviewGenerator:
     def _generate_explode_preview(self) -> ModePreview:
         """Generate preview for EXPLODE mode."""
         # Create sample exploded output
-        sample_df = self._create_explode_sample()
+        sample_rows = self._create_explode_sample()
         
         return ModePreview(
             mode_id=2,
@@ -121,7 +159,7 @@ class PreviewGenerator:
             output_files=1,
             output_file_names=["output.csv"],
             estimated_rows=self.analysis.estimated_exploded_rows,
-            sample_table=self._df_to_ascii(sample_df, max_cols=5),
+            sample_table=self._rows_to_ascii(sample_rows, max_cols=5),
             pros=["100% flat - works directly in Excel/SQL", "Can filter by ANY field", "Pivot table ready"],
             cons=["Data duplication (larger file)", f"~{self.analysis.estimated_exploded_rows:,} rows from {self.analysis.record_count:,} records"]
         )
@@ -136,9 +174,9 @@ class PreviewGenerator:
         
         # Build combined preview
         preview_parts = []
-        for table_name, df in tables.items():
+        for table_name, rows in tables.items():
             preview_parts.append(f"  {table_name}.csv:")
-            preview_parts.append(self._df_to_ascii(df, max_cols=4, indent=4))
+            preview_parts.append(self._rows_to_ascii(rows, max_cols=4, indent=4, max_rows=2))
             preview_parts.append("")
         
         # Create file list description
@@ -162,49 +200,46 @@ class PreviewGenerator:
             cons=[f"{len(tables)} files to manage", "Need VLOOKUP/JOIN for full view"]
         )
     
-    def _create_flat_sample(self) -> pd.DataFrame:
-        """Create sample DataFrame for flat mode."""
+    def _create_flat_sample(self) -> List[Dict]:
+        """Create sample row for flat mode."""
         if not self.sample_record:
-            return pd.DataFrame()
+            return []
         
-        # Use json_normalize with array conversion
-        record = self._convert_arrays_to_strings(self.sample_record.copy())
-        df = pd.json_normalize([record], sep='.')
-        return df.head(1)
+        # Arrays become strings, then nested dicts flatten to dotted keys
+        record = self._convert_arrays_to_strings(self.sample_record)
+        row = {}
+        _flat_scalars(record, "", row)
+        return [row]
     
-    def _create_explode_sample(self) -> pd.DataFrame:
-        """Create sample DataFrame for explode mode."""
+    def _create_explode_sample(self) -> List[Dict]:
+        """Create sample rows for explode mode."""
         if not self.sample_record:
-            return pd.DataFrame()
+            return []
         
         # Find deepest array path and explode
         rows = self._explode_record(self.sample_record)
-        if rows:
-            df = pd.DataFrame(rows[:3])  # Show first 3 rows
-            return df
-        return pd.DataFrame()
+        return rows[:3]  # Show first 3 rows
     
-    def _create_relational_sample(self) -> Dict[str, pd.DataFrame]:
-        """Create sample DataFrames for relational mode."""
+    def _create_relational_sample(self) -> Dict[str, List[Dict]]:
+        """Create sample rows for relational mode."""
         if not self.sample_record:
             return {}
         
-        tables = self._extract_relational_tables(self.sample_record)
-        # Limit to 2 rows per table for preview
-        return {name: df.head(2) for name, df in tables.items()}
+        # Whole tables: the preview shows 2 rows of each, under all its columns
+        return self._extract_relational_tables(self.sample_record)
     
     def _convert_arrays_to_strings(self, record: Dict) -> Dict:
         """Convert arrays to strings for flat mode preview."""
         result = {}
         for key, value in record.items():
-            if isinstance(value, dict):
+            if type(value) is dict:
                 nested = self._convert_arrays_to_strings(value)
                 result[key] = nested
-            elif isinstance(value, list):
-                if value and isinstance(value[0], dict):
-                    result[key] = json.dumps(value, ensure_ascii=False)[:50] + "..."
+            elif type(value) is list:
+                if value and type(value[0]) is dict:
+                    result[key] = dumps_cell_head(value, 50) + "..."
                 else:
-                    result[key] = "|".join(str(v) for v in value)
+                    result[key] = "|".join(map(str, value))
             else:
                 result[key] = value
         return result
@@ -220,17 +255,15 @@ class PreviewGenerator:
         arrays_to_explode = []
         
         for key, value in record.items():
-            if isinstance(value, dict):
+            if type(value) is dict:
                 # Flatten nested dict
-                for k, v in pd.json_normalize([value], sep='.').iloc[0].items():
-                    if not isinstance(v, (list, dict)):
-                        base_row[f"{key}.{k}"] = v
-            elif isinstance(value, list) and value and isinstance(value[0], dict):
+                _flat_scalars(value, f"{key}.", base_row)
+            elif type(value) is list and value and type(value[0]) is dict:
                 # Array of objects - need to explode
                 arrays_to_explode.append((key, value))
-            elif isinstance(value, list):
+            elif type(value) is list:
                 # Primitive array
-                base_row[key] = "|".join(str(v) for v in value)
+                base_row[key] = "|".join(map(str, value))
             else:
                 base_row[key] = value
         
@@ -242,34 +275,38 @@ class PreviewGenerator:
         array_name, array_items = arrays_to_explode[0]
         
         for item in array_items:
-            row = base_row.copy()
-            # Add array item fields
-            if isinstance(item, dict):
-                for k, v in item.items():
-                    if isinstance(v, list) and v and isinstance(v[0], dict):
-                        # Nested array - explode further
-                        for nested_item in v:
-                            nested_row = row.copy()
-                            for nk, nv in nested_item.items():
-                                if isinstance(nv, list):
-                                    nested_row[f"{k}.{nk}"] = "|".join(str(x) for x in nv)
-                                elif not isinstance(nv, dict):
-                                    nested_row[f"{k}.{nk}"] = nv
-                            rows.append(nested_row)
-                    elif isinstance(v, list):
-                        row[k] = "|".join(str(x) for x in v)
-                    elif isinstance(v, dict):
-                        for dk, dv in v.items():
-                            if not isinstance(dv, (dict, list)):
-                                row[f"{k}.{dk}"] = dv
-                    else:
-                        row[k] = v
-                if not any(isinstance(v, list) and v and isinstance(v[0], dict) for v in item.values()):
-                    rows.append(row)
+            if type(item) is not dict:
+                continue
+            # Add array item fields; each row is built once from base_row
+            # plus the item's fields (plus a nested item's fields)
+            delta = {}
+            exploded = False
+            for k, v in item.items():
+                if type(v) is list and v and type(v[0]) is dict:
+                    # Nested array - explode further
+                    exploded = True
+                    for nested_item in v:
+                        nested = {}
+                        for nk, nv in nested_item.items():
+                            if type(nv) is list:
+                                nested[f"{k}.{nk}"] = "|".join(map(str, nv))
+                            elif type(nv) is not dict:
+                                nested[f"{k}.{nk}"] = nv
+                        rows.append({**base_row, **delta, **nested})
+                elif type(v) is list:
+                    delta[k] = "|".join(map(str, v))
+                elif type(v) is dict:
+                    for dk, dv in v.items():
+                        if type(dv) in SCALAR_TYPES:
+                            delta[f"{k}.{dk}"] = dv
+                else:
+                    delta[k] = v
+            if not exploded:
+                rows.append({**base_row, **delta})
         
         return rows if rows else [base_row]
     
-    def _extract_relational_tables(self, record: Dict) -> Dict[str, pd.DataFrame]:
+    def _extract_relational_tables(self, record: Dict) -> Dict[str, List[Dict]]:
         """Extract relational tables from a record - recursively finds all nested arrays."""
         tables = {}
         
@@ -290,21 +327,21 @@ class PreviewGenerator:
         )
         
         # Insert main table first
-        tables = {"main": pd.DataFrame([main_row]), **tables}
+        tables = {"main": [main_row], **tables}
         return tables
     
     def _find_root_id(self, record: Dict) -> tuple:
         """Find the root ID field, even if nested in wrapper object."""
         # Check top level
         id_field = self._find_id_field(record)
-        if id_field in record and not isinstance(record[id_field], dict):
+        if id_field in record and type(record[id_field]) is not dict:
             return id_field, record.get(id_field, "unknown")
         
         # Check inside wrapper objects (like 'employee', 'data', etc.)
         for key, value in record.items():
-            if isinstance(value, dict):
+            if type(value) is dict:
                 nested_id = self._find_id_field(value)
-                if nested_id in value and not isinstance(value[nested_id], dict):
+                if nested_id in value and type(value[nested_id]) is not dict:
                     return nested_id, value.get(nested_id, "unknown")
         
         return "id", "unknown"
@@ -319,7 +356,7 @@ class PreviewGenerator:
         for key, value in obj.items():
             full_key = f"{prefix}.{key}" if prefix else key
             
-            if isinstance(value, dict):
+            if type(value) is dict:
                 # Recurse into nested object
                 self._extract_tables_recursive(
                     value, tables, main_row,
@@ -327,16 +364,19 @@ class PreviewGenerator:
                     full_key, current_parent_ids
                 )
                 
-            elif isinstance(value, list) and value and isinstance(value[0], dict):
+            elif type(value) is list and value and type(value[0]) is dict:
                 # Array of objects -> separate table
                 table_name = key  # Use array field name as table name
                 child_rows = []
+                # Parent ID columns are the same for every item of the array
+                parent_id_columns = {
+                    f"{table_name}_{pid_field}": pid_value
+                    for pid_field, pid_value in current_parent_ids.items()
+                }
                 
                 for item in value:
-                    child_row = {}
                     # Add parent IDs
-                    for pid_field, pid_value in current_parent_ids.items():
-                        child_row[f"{table_name}_{pid_field}"] = pid_value
+                    child_row = parent_id_columns.copy()
                     
                     # Find this item's ID
                     item_id_field = self._find_id_field(item)
@@ -344,72 +384,84 @@ class PreviewGenerator:
                     
                     # Process item fields
                     for k, v in item.items():
-                        if isinstance(v, list) and v and isinstance(v[0], dict):
+                        if type(v) is list and v and type(v[0]) is dict:
                             # Nested array -> another table (recurse)
                             nested_parent_ids = current_parent_ids.copy()
                             nested_parent_ids[item_id_field] = item_id_value
                             
+                            nested_id_columns = {
+                                f"{k}_{pid_field}": pid_value
+                                for pid_field, pid_value in nested_parent_ids.items()
+                            }
+                            
                             nested_rows = []
                             for nested_item in v:
-                                nested_row = {}
-                                for pid_field, pid_value in nested_parent_ids.items():
-                                    nested_row[f"{k}_{pid_field}"] = pid_value
+                                nested_row = nested_id_columns.copy()
                                 
                                 for nk, nv in nested_item.items():
-                                    if isinstance(nv, list):
-                                        if nv and isinstance(nv[0], dict):
-                                            nested_row[nk] = json.dumps(nv)[:50] + "..."
+                                    if type(nv) is list:
+                                        if nv and type(nv[0]) is dict:
+                                            nested_row[nk] = dumps_cell_head(nv, 50) + "..."
                                         else:
-                                            nested_row[nk] = "|".join(str(x) for x in nv)
-                                    elif isinstance(nv, dict):
+                                            nested_row[nk] = "|".join(map(str, nv))
+                                    elif type(nv) is dict:
                                         for dk, dv in nv.items():
-                                            if not isinstance(dv, (dict, list)):
+                                            if type(dv) in SCALAR_TYPES:
                                                 nested_row[f"{nk}.{dk}"] = dv
                                     else:
                                         nested_row[nk] = nv
                                 nested_rows.append(nested_row)
                             
-                            if k not in tables:
-                                tables[k] = pd.DataFrame(nested_rows)
+                            # Rows from every parent item, not just the first
+                            tables.setdefault(k, []).extend(nested_rows)
                             
-                        elif isinstance(v, list):
-                            child_row[k] = "|".join(str(x) for x in v)
-                        elif isinstance(v, dict):
+                        elif type(v) is list:
+                            child_row[k] = "|".join(map(str, v))
+                        elif type(v) is dict:
                             for dk, dv in v.items():
-                                if not isinstance(dv, (dict, list)):
+                                if type(dv) in SCALAR_TYPES:
                                     child_row[f"{k}.{dk}"] = dv
                         else:
                             child_row[k] = v
                     
                     child_rows.append(child_row)
                 
-                if table_name not in tables:
-                    tables[table_name] = pd.DataFrame(child_rows)
+                tables.setdefault(table_name, []).extend(child_rows)
                     
-            elif isinstance(value, list):
+            elif type(value) is list:
                 # Primitive array
-                main_row[full_key] = "|".join(str(v) for v in value)
+                main_row[full_key] = "|".join(map(str, value))
             else:
                 # Scalar value - add to main
                 main_row[full_key] = value
     
     def _find_id_field(self, record: Dict) -> str:
-        """Find the ID field in a record."""
-        for key in record.keys():
-            if key.lower() in ['id', 'employee_id', 'employeeid', 'userid', 'user_id', '_id']:
-                return key
-            if key.lower().endswith('id') and len(key) <= 15:
+        """
+        Find the ID field in a record: the first key ending in "id".
+        
+        The named aliases (id, _id, user_id, employeeid, ...) all end in
+        "id" and are short, so they need no separate lookup.
+        """
+        for key in record:
+            if len(key) <= 15 and key.lower().endswith('id'):
                 return key
-        return list(record.keys())[0] if record else "id"
+        return next(iter(record), "id")
     
-    def _df_to_ascii(self, df: pd.DataFrame, max_cols: int = 4, max_width: int = 15, indent: int = 2) -> str:
-        """Convert DataFrame to ASCII table representation."""
-        if df.empty:
+    def _rows_to_ascii(self, rows: List[Dict], max_cols: int = 4, max_width: int = 15,
+                       indent: int = 2, max_rows: int = 3) -> str:
+        """
+        Convert sample rows to ASCII table representation.
+        
+        Columns are the keys of all rows in first-seen order; a row without
+        a column shows an empty cell. Only the first max_rows rows are drawn.
+        """
+        columns = list(dict.fromkeys(key for row in rows for key in row))
+        if not columns:
             return " " * indent + "(empty)"
         
         # Limit columns
-        cols = list(df.columns)[:max_cols]
-        if len(df.columns) > max_cols:
+        cols = columns[:max_cols]
+        if len(columns) > max_cols:
             cols_display = cols + ["..."]
         else:
             cols_display = cols
@@ -429,14 +481,14 @@ class PreviewGenerator:
         ]
         
         # Build rows
-        for _, row in df.head(3).iterrows():
-            values = [truncate(row[c]) if c in row else "..." for c in cols]
-            if len(df.columns) > max_cols:
+        for row in rows[:max_rows]:
+            values = [truncate(row.get(c)) for c in cols]
+            if len(columns) > max_cols:
                 values.append("...")
             lines.append(" " * indent + " | ".join(values))
         
-        if len(df) > 3:
-            lines.append(" " * indent + f"... ({len(df)} rows total)")
+        if len(rows) > max_rows:
+            lines.append(" " * indent + f"... ({len(rows)} rows total)")
         
         return "\n".join(lines)
     
@@ -513,10 +565,12 @@ class PreviewGenerator:
         return lines
     
     def display_full_preview(self) -> str:
-        """Generate complete interactive preview display."""
-        sections = [
-            self.generate_header(),
-            self.generate_structure_tree(),
-            self.generate_mode_options()
-        ]
-        return "\n".join(sections)
+        """Generate complete interactive preview display (built once)."""
+        if self._full_preview is None:
+            sections = [
+                self.generate_header(),
+                self.generate_structure_tree(),
+                self.generate_mode_options()
+            ]
+            self._full_preview = "\n".join(sections)
+        return self._full_preview
@@ -9,11 +9,15 @@ For most cases, just use the pipeline directly without validation.
 """
 
 from typing import List, Optional, Any, Dict
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict, TypeAdapter
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Records validated per TypeAdapter call; a batch with an invalid record is
+# re-validated one record at a time to report each failure
+VALIDATION_BATCH_SIZE = 10_000
+
 
 class FlexibleRecord(BaseModel):
     """
@@ -44,6 +48,8 @@ class DataValidator:
             schema_model: Pydantic model for validation (default: FlexibleRecord)
         """
         self.schema_model = schema_model
+        # Validates a whole batch in one call into pydantic-core
+        self._batch_adapter = TypeAdapter(List[schema_model])
         self.validated_records: List[BaseModel] = []
         self.failed_records: List[dict] = []
 
@@ -63,7 +69,32 @@ class DataValidator:
 
         logger.info(f"Validating {len(records)} records")
 
-        for idx, record in enumerate(records):
+        for start in range(0, len(records), VALIDATION_BATCH_SIZE):
+            batch = records[start:start + VALIDATION_BATCH_SIZE]
+            # Only plain dicts: Model(**record) and validate_python agree on them
+            if all(type(record) is dict for record in batch):
+                try:
+                    validated_batch = self._batch_adapter.validate_python(batch)
+                except Exception:
+                    pass
+                else:
+                    valid_records.extend(self._batch_adapter.dump_python(validated_batch))
+                    continue
+            self._validate_one_by_one(batch, start, strict, valid_records, invalid_records)
+
+        logger.info(f"Validation: {len(valid_records)} valid, {len(invalid_records)} invalid")
+        return valid_records, invalid_records
+
+    def _validate_one_by_one(
+        self,
+        batch: List[dict],
+        start: int,
+        strict: bool,
+        valid_records: List[dict],
+        invalid_records: List[dict]
+    ) -> None:
+        """Validate a batch record by record, collecting the results in order."""
+        for idx, record in enumerate(batch, start):
             try:
                 validated = self.schema_model(**record)
                 valid_records.append(validated.model_dump())
@@ -78,6 +109,3 @@ class DataValidator:
 
                 if strict:
                     raise ValueError(f"Validation failed at record {idx + 1}: {str(e)}")
-
-        logger.info(f"Validation: {len(valid_records)} valid, {len(invalid_records)} invalid")
-        return valid_records, invalid_records